@@ -0,0 +1,140 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from array import array
+
+import FlowerBreeding
+
+def clearCaches(): #Forgets every remembered cross and gene test, so timings don't depend on what ran before
+    FlowerBreeding.pairOutcomes.clear()
+    FlowerBreeding.potentialColours.cache_clear()
+    FlowerBreeding.geneTestResult.cache_clear()
+    FlowerBreeding.routeTable.cache_clear()
+    FlowerBreeding.distinguishingGenes.cache_clear()
+    FlowerBreeding.speciesSolutions.clear()
+
+def warmScenarios(): #clearCaches, then solve the default seeds, as a process answering scenario queries would have done first
+    clearCaches()
+    FlowerBreeding.solve_scenario(FlowerBreeding.initialflowerPool)
+
+def inventories(count): #The default seeds plus 3 random flowers of any name, the same ones every run
+    generator = random.Random(0)
+    flowers = FlowerBreeding.allFlowers()
+    return [FlowerBreeding.initialflowerPool + generator.sample(flowers, 3) for inventory in range(count)]
+
+def resetGroups(groups): #clearCaches, and forgets which partners each ungened group was tested with, as IdentifyUngenedFlowers keeps that on the groups
+    clearCaches()
+    for group in groups.values():
+        group.pop("Tested", None)
+
+def corpus(flowerName): #Every gene code a flower name can have, as flowers. Cosmo is the 3 gene corpus, Rose the 4 gene one.
+    flowerBase = FlowerBreeding.flowerNumbers[flowerName] * FlowerBreeding.GeneCodeCount
+    return [FlowerBreeding.Flower.fromId(flowerBase + gene) for gene in FlowerBreeding.flowerGeneCodes(flowerName)]
+
+def allPairs(flowers): #Each flower with itself and every later flower
+    return [[flowerA, flowerB] for position, flowerA in enumerate(flowers) for flowerB in flowers[position:]]
+
+def ungenedGroups(flowers): #The ungened groups from breeding every pair of flowers
+    UngenedflowerPool = {}
+    IdentifiedFlowers = {flowerName: {} for flowerName in FlowerBreeding.flowerList}
+    FlowerBreeding.BreedNewFlowers(FlowerBreeding.KnownFlowerIndex(flowers), IdentifiedFlowers, UngenedflowerPool)
+    return UngenedflowerPool
+
+def benchmarks(): #[name, function to time, setup run before each timing (or None), corpus size] for every benchmark
+    found = []
+    FlowerBreeding.getCrossTable()
+    FlowerBreeding.getColourTable()
+    for corpusName, flowerName in [["3 gene", "Cosmo"], ["4 gene", "Rose"]]:
+        flowers = corpus(flowerName)
+        pairs = allPairs(flowers)
+        children = [FlowerBreeding.breed(flowerA, flowerB) for flowerA, flowerB in pairs]
+        seeds = [flower for flower in FlowerBreeding.initialflowerPool if flower.flowerName == flowerName]
+        tests = [{candidate: FlowerBreeding.potentialColours(candidate, testFlower) for candidate in flowers[:9]} for testFlower in flowers]
+        groups = ungenedGroups(seeds + [flower for flower in flowers if flower not in seeds][:6])
+        found.append(["breed " + corpusName, lambda pairs=pairs: [FlowerBreeding.breed(flowerA, flowerB) for flowerA, flowerB in pairs], None, len(pairs)])
+        parentsA = array('I', [flowerA.flowerId for flowerA, flowerB in pairs])
+        parentsB = array('I', [flowerB.flowerId for flowerA, flowerB in pairs])
+        found.append(["breed_many " + corpusName, lambda parentsA=parentsA, parentsB=parentsB: FlowerBreeding.breed_many(parentsA, parentsB), None, len(pairs)])
+        found.append(["crossAllPairs " + corpusName, lambda flowers=flowers: FlowerBreeding.crossAllPairs(flowers), None, len(pairs)])
+        found.append(["punnettSquare " + corpusName, lambda pairs=pairs: [FlowerBreeding.punnettSquare(flowerA.GeneNumbers[i], flowerB.GeneNumbers[i]) for flowerA, flowerB in pairs for i in range(4)], None, len(pairs)])
+        found.append(["IdentifyFlowersFromBreed " + corpusName, lambda children=children: [FlowerBreeding.IdentifyFlowersFromBreed(breedList) for breedList in children], None, len(children)])
+        found.append(["calculateTest " + corpusName, lambda tests=tests: [FlowerBreeding.calculateTest(test) for test in tests], None, len(tests)])
+        found.append(["IdentifyUngenedFlowers " + corpusName,
+                      lambda groups=groups, seeds=seeds: FlowerBreeding.IdentifyUngenedFlowers(groups, {flowerName: {} for flowerName in FlowerBreeding.flowerList}, FlowerBreeding.KnownFlowerIndex(seeds)),
+                      lambda groups=groups: resetGroups(groups), len(groups)])
+        found.append(["solve " + flowerName, lambda flowerName=flowerName: FlowerBreeding.solve([flowerName], workers=1), clearCaches, 1])
+    scenarios = inventories(20)
+    found.append(["solve_scenario distinct inventories", lambda: [FlowerBreeding.solve_scenario(scenario) for scenario in scenarios], warmScenarios, len(scenarios)])
+    found.append(["solve_scenario repeated inventory", lambda: [FlowerBreeding.solve_scenario(FlowerBreeding.initialflowerPool) for scenario in scenarios], warmScenarios, len(scenarios)])
+    found.append(["solve all flowers", lambda: FlowerBreeding.solve(FlowerBreeding.flowerList, workers=1), clearCaches, len(FlowerBreeding.flowerList)])
+    return found
+
+def timeBenchmark(function, setup, repeats): #Fastest of several runs, in seconds
+    times = []
+    for repeat in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def runBenchmarks(selected = None, repeats = 5): #Runs the benchmarks whose names contain any of the selected strings (all of them by default)
+    """
+    :return: {"python": version, "platform": platform, "benchmarks": {name: {"seconds": fastest run, "items": corpus size, "secondsPerItem": seconds / items}}}
+    """
+    results = {}
+    for name, function, setup, items in benchmarks():
+        if selected and not any(part in name for part in selected):
+            continue
+        seconds = timeBenchmark(function, setup, repeats)
+        results[name] = {"seconds": seconds, "items": items, "secondsPerItem": seconds / items}
+    return {"python": platform.python_version(), "platform": platform.platform(), "benchmarks": results}
+
+def compareToBaseline(results, baseline, tolerance): #Compares two runBenchmarks outputs. Returns [report lines, names that got slower by more than tolerance (0.2 = 20%)]
+    lines = []
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            lines.append(name + ": " + "%.6f" % result["seconds"] + "s (no baseline)")
+            continue
+        ratio = result["seconds"] / baseline["benchmarks"][name]["seconds"]
+        lines.append(name + ": " + "%.6f" % result["seconds"] + "s, " + "%.2f" % ratio + "x baseline")
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+    return [lines, regressions]
+
+def main(arguments = None):
+    """
+    :param arguments: Command line arguments, defaults to sys.argv[1:]
+    :return: Exit code; 1 if compared to a baseline and something got slower than the tolerance allows
+    """
+    parser = argparse.ArgumentParser(description="Times breed(), breed_many(), crossAllPairs(), punnettSquare(), IdentifyFlowersFromBreed(), calculateTest(), IdentifyUngenedFlowers(), whole solves and solve_scenario().")
+    parser.add_argument("benchmarks", nargs="*", help="Only run benchmarks whose names contain one of these, e.g. breed or Rose")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs of each benchmark; the fastest is kept (default: 5)")
+    parser.add_argument("--output", help="Write the results as JSON to this file (default: print them)")
+    parser.add_argument("--baseline", help="Compare against results saved earlier with --output")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline before failing (default: 0.2, i.e. 20%%)")
+    args = parser.parse_args(arguments)
+
+    results = runBenchmarks(args.benchmarks, args.repeats)
+    if args.output:
+        with open(args.output, "w") as outputFile:
+            json.dump(results, outputFile, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    if args.baseline:
+        with open(args.baseline) as baselineFile:
+            lines, regressions = compareToBaseline(results, json.load(baselineFile), args.tolerance)
+        for line in lines:
+            print(line)
+        if regressions:
+            print("Slower than baseline: " + ", ".join(regressions))
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
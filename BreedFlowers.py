@@ -0,0 +1,48 @@
+import argparse
+
+import FlowerBreeding
+
+def main(arguments = None): #Solves the given flower names (all of them by default) and prints how to breed and identify every flower found
+    """
+    :param arguments: Command line arguments, defaults to sys.argv[1:]
+    :return: None
+
+    Prints the number of seed flowers, then for each flower name (in flowerList order) the text for every flower found, then the number of flowers found.
+    """
+    parser = argparse.ArgumentParser(description="Works out how to breed and identify every flower gene code, starting from the seed flowers.")
+    parser.add_argument("flowers", nargs="*", help="Flower names to solve (default: all of " + ", ".join(FlowerBreeding.flowerList) + ")")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="Solve from scratch instead of loading a saved solution, and don't save this one")
+    parser.add_argument("--report", metavar="PATH", help="Instead of the breeding routes, write whether and how every gene code can be reached to PATH, as csv (or columnar JSON if PATH ends with .json)")
+    parser.add_argument("--profile", metavar="PATH", help="Solve from scratch and write each generation's phase timings, counts and pool sizes to PATH as JSON")
+    args = parser.parse_args(arguments)
+    for flowerName in args.flowers:
+        if flowerName not in FlowerBreeding.flowerList:
+            parser.error("unknown flower " + repr(flowerName) + ", choose from " + ", ".join(FlowerBreeding.flowerList))
+    species = args.flowers or FlowerBreeding.flowerList
+
+    if args.report:
+        report = FlowerBreeding.reachabilityReport(species, workers=args.workers)
+        FlowerBreeding.writeReport(report, args.report)
+        print(str(report["Found"].count(True)) + " of " + str(len(report["Found"])) + " gene codes found")
+        return
+
+    print(len([flower for flower in FlowerBreeding.initialflowerPool if flower.flowerName in species]))
+    profile = None
+    if args.profile:
+        profile = FlowerBreeding.SolverProfile()
+        UpdatedFlowerPool, breedingRoutes, geneTests = FlowerBreeding.solve(species, workers=args.workers, profile=profile)
+    elif args.no_cache:
+        UpdatedFlowerPool, breedingRoutes, geneTests = FlowerBreeding.solve(species, workers=args.workers)
+    else:
+        UpdatedFlowerPool, breedingRoutes, geneTests = FlowerBreeding.solveCached(species, workers=args.workers)
+    for flowerName in species:
+        for routeText in breedingRoutes[flowerName]:
+            print(routeText)
+    print(len(UpdatedFlowerPool))
+    if profile is not None:
+        with open(args.profile, "w") as profileFile:
+            profileFile.write(profile.toJSON())
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,82 @@
 import csv
+import functools
+import hashlib
+import heapq
+import json
+import math
+import os
+import pickle
+import time
+from array import array
+from collections import OrderedDict, namedtuple
+from fractions import Fraction
 
 class Flower(object):
-    """This is a class of 5 input variables, and 4 internal variables;
+    """This is a class of 5 input variables, and 1 internal variable;
      Inputs: A flower name, ideally taken from 'flowerList',
      Numbers of R,Y,W, and B dominent genes in the flowers gene code
 
      Internals:
+     flowerId; the flower name and gene code packed into one number, flowerList position * 81 + GeneList position. Two flowers are equal if their flowerIds are equal.
+
+     Everything else is read off the flowerId when it is asked for (colour from the compiled colour table):
      flowerName; as flower name is inputted
-     Gene Numbers; internal numbers based on inputs of R,Y,W,B. Used for Punnett Square calculations
+     GeneIndex; position of the gene code in GeneList (0 to 80)
+     Gene Numbers; numbers of R,Y,W,B. Used for Punnett Square calculations
      GeneCode; Manifestation of the Gene numbers in letter format. Used often to categorise the flowers and search for other properties, such as colour.
      Colour; The colour of the flower, which is a property we can see as a manifestation of the gene code in the flower type. Used as a primary test for unique genes.
 
+     There is only ever one Flower object for each flowerId; Flower("Rose",0,0,1,0) twice gives back the same object.
      """
-    def __init__(self,flowerName ,redGene, yellowGene, whiteGene, blueGene = 0 ):
-        self.flowerName = flowerName
-        self.GeneNumbers = [redGene, yellowGene, whiteGene, blueGene]
-        self.GeneCode = geneCodeTranslator(self.GeneNumbers[0],self.GeneNumbers[1],self.GeneNumbers[2],self.GeneNumbers[3])
-        self.colour = FlowerGeneColour[self.flowerName][self.GeneCode]
+    __slots__ = ("flowerId",)
+    _instances = {} #flowerId : Flower, every flower made so far
+
+    def __new__(cls, flowerName, redGene, yellowGene, whiteGene, blueGene = 0):
+        return cls.fromId(flowerNumbers[flowerName] * GeneCodeCount + geneIndex(redGene, yellowGene, whiteGene, blueGene))
+
+    @classmethod
+    def fromId(cls, flowerId): #Gives the flower for a flowerId, only making a new object the first time that flowerId is asked for
+        flower = cls._instances.get(flowerId)
+        if flower is None:
+            flower = object.__new__(cls)
+            flower.flowerId = flowerId
+            cls._instances[flowerId] = flower
+        return flower
+
+    @property
+    def flowerName(self):
+        return flowerList[self.flowerId // GeneCodeCount]
+
+    @property
+    def GeneIndex(self):
+        return self.flowerId % GeneCodeCount
+
+    @property
+    def GeneNumbers(self):
+        return GeneNumberList[self.flowerId % GeneCodeCount]
+
+    @property
+    def GeneCode(self):
+        return GeneList[self.flowerId % GeneCodeCount]
+
+    @property
+    def colour(self):
+        colourNumber = getColourTable()[self.flowerId]
+        if colourNumber == NoColour:
+            raise KeyError(self.flowerName + " has no colour for " + self.GeneCode)
+        return Colours[colourNumber]
+
+    def __eq__(self, other):
+        return isinstance(other, Flower) and self.flowerId == other.flowerId
+
+    def __hash__(self):
+        return self.flowerId
+
+    def __reduce__(self): #Unpickled flowers go back through Flower() so they stay the one shared object
+        return (Flower, (self.flowerName,) + tuple(self.GeneNumbers))
+
+    def __repr__(self):
+        return "Flower(" + repr(self.flowerName) + ", " + ", ".join(map(str, self.GeneNumbers)) + ")"
 
 def geneCodeTranslator(red,yellow,white,blue):
     #Takes in the number of dominient R,Y,W,B genes and outputs a gene code. e.g. an input 0,2,1,0 gives a code rrYYWwbb
@@ -56,37 +116,23 @@ def unique(inList): #takes a list and outputs a list of each unique element from
     return outList
 
 def breed(flower_1, flower_2): #Takes two flower classes, and outputs all possible children of those two flowers.
-    #the output is a dictionary of the form: {child_flower : {"Probability" (of this child): n% , "Parents" (of this child): [ParentA, ParentB]}
+    #the output is a dictionary of the form: {child_flower : {"Count" (of this child, out of CrossCombinations): n , "Parents" (of this child): [ParentA, ParentB]}
     """
     :param flower_1, flower_2: parent flowers, from which we want to find all possible children flowers
     :return: A dictionary of all possible children flowers in the format:
-    {child_flower: {Probability: n%, Parents: [ParentA, ParentB]}}
-    This is achieved using the Punnett Square Function
+    {child_flower: {Count: n, Parents: [ParentA, ParentB]}}
+    where the probability of the child is Count / CrossCombinations (256). Keeping the whole number count means probabilities add up and compare exactly.
+    This is a lookup into the cross table, which is built once from the Punnett Square Function
     """
     childflowers = {}
-    if flower_1.flowerName == flower_2.flowerName:
-        newFlowerGenes = []
-        ListtoAppend = []
-        for i in range(4):
-            ListtoAppend.append(punnettSquare(flower_1.GeneNumbers[i],flower_2.GeneNumbers[i]))
-        for REntry in ListtoAppend[0]:
-            for YEntry in ListtoAppend[1]:
-                for WEntry in ListtoAppend[2]:
-                    for BEntry in ListtoAppend[3]:
-                        newFlowerGenes.append([REntry, YEntry, WEntry, BEntry])
-        #print(newFlowerGenes)
-        uniqueFlowerGenes = unique(newFlowerGenes)
-        #print(uniqueFlowerGenes)
-        #print(uniqueFlowerGenes)
-        probabilityList = {}
-        for genes in uniqueFlowerGenes:
-            ProbabilityIndex = geneCodeTranslator(genes[0], genes[1], genes[2], genes[3])
-            probabilityList[ProbabilityIndex] = float(newFlowerGenes.count(genes))/float(len(newFlowerGenes))
-        for genes in uniqueFlowerGenes:
-            ProbabilityIndex = geneCodeTranslator(genes[0], genes[1], genes[2], genes[3])
-            child = Flower(flower_1.flowerName,genes[0],genes[1],genes[2],genes[3])
+    if flower_1.flowerId // GeneCodeCount == flower_2.flowerId // GeneCodeCount:
+        offsets, childGenes, childCounts = getCrossTable()
+        flowerBase = flower_1.flowerId - flower_1.GeneIndex
+        pairIndex = flower_1.GeneIndex * GeneCodeCount + flower_2.GeneIndex
+        for entry in range(offsets[pairIndex], offsets[pairIndex + 1]):
+            child = Flower.fromId(flowerBase + childGenes[entry])
             childflowers[child] = {}
-            childflowers[child]["Probability"] = probabilityList[ProbabilityIndex]
+            childflowers[child]["Count"] = childCounts[entry]
             childflowers[child]["Parents"] = [flower_1, flower_2]
 
     return childflowers
@@ -122,98 +168,471 @@ def punnettSquare(GeneNumber_1, GeneNumber_2): #Takes gene numbering for one bre
 
     return output #
 
+def geneIndex(red, yellow, white, blue = 0): #Takes gene numbers and gives the position of that gene code in GeneList, e.g. 0,2,1,0 gives 7 (rrYYWwbb)
+    return blue*27 + red*9 + yellow*3 + white
+
+def buildCrossTable(): #Breeds every pair of gene codes in GeneList once, so breed(x,y) only has to look its children up.
+    """
+    :return: [offsets, childGenes, childCounts], three compact arrays.
+    The children of gene codes A and B (as GeneList positions) are childGenes[offsets[A*81 + B]:offsets[A*81 + B + 1]],
+    and childCounts holds how many of the 256 Punnett square combinations give each of those children.
+    Children are listed in the same order the old punnett square expansion found them in (R, then Y, then W, then B).
+
+    Each gene is crossed on its own, and the per gene outcomes are multiplied together, so no 256 entry list is ever built.
+    3 gene flowers only use the first 27 gene codes (bb), and their children stay within those 27.
+    """
+    locusOutcomes = [] #locusOutcomes[x][y] is a list of [child gene number, count out of 4] for one gene
+    for GeneNumber_1 in range(3):
+        locusOutcomes.append([])
+        for GeneNumber_2 in range(3):
+            square = punnettSquare(GeneNumber_1, GeneNumber_2)
+            locusOutcomes[GeneNumber_1].append([[number, square.count(number)] for number in range(3) if number in square])
+    offsets = array('I', [0])
+    childGenes = array('B')
+    childCounts = array('H')
+    for genesA in GeneNumberList:
+        for genesB in GeneNumberList:
+            crosses = [locusOutcomes[genesA[i]][genesB[i]] for i in range(4)]
+            for R, RCount in crosses[0]:
+                for Y, YCount in crosses[1]:
+                    for W, WCount in crosses[2]:
+                        for B, BCount in crosses[3]:
+                            childGenes.append(geneIndex(R, Y, W, B))
+                            childCounts.append(RCount * YCount * WCount * BCount)
+            offsets.append(len(childGenes))
+    return [offsets, childGenes, childCounts]
+
+def getCrossTable(): #Builds the cross table on first use and keeps it for every later breed(x,y)
+    global crossTable
+    if crossTable is None:
+        crossTable = buildCrossTable()
+    return crossTable
+
+def buildParentIndex(geneCodes): #Inverts the cross table: for each child gene code, every pair of gene codes that can breed it, likeliest first
+    """
+    :param geneCodes: The GeneList positions parents may have, e.g. flowerGeneCodes("Rose") (all 81) or the 27 bb gene codes of a 3 gene flower
+    :return: [offsets, parentPairs, parentCounts], three compact arrays.
+    The parents of gene code C are parentPairs[offsets[C]:offsets[C + 1]], each stored as A*81 + B (A <= B, both from geneCodes),
+    and parentCounts holds how many of the 256 Punnett square combinations of that pair give C.
+    Each child's parents are sorted by count, highest first, then by pair, so the first entry is always the likeliest pair.
+    """
+    offsets, childGenes, childCounts = getCrossTable()
+    geneCodes = sorted(geneCodes)
+    parents = [[] for gene in range(GeneCodeCount)]
+    for position, geneA in enumerate(geneCodes):
+        for geneB in geneCodes[position:]:
+            pairIndex = geneA * GeneCodeCount + geneB
+            for entry in range(offsets[pairIndex], offsets[pairIndex + 1]):
+                parents[childGenes[entry]].append((-childCounts[entry], pairIndex))
+    parentOffsets = array('I', [0])
+    parentPairs = array('H')
+    parentCounts = array('H')
+    for childParents in parents:
+        childParents.sort()
+        for negativeCount, pairIndex in childParents:
+            parentPairs.append(pairIndex)
+            parentCounts.append(-negativeCount)
+        parentOffsets.append(len(parentPairs))
+    return [parentOffsets, parentPairs, parentCounts]
+
+def getParentIndex(flowerName): #The parent index for a flower name's gene codes, built on first use and shared by every flower name with the same gene codes
+    geneCodes = tuple(flowerGeneCodes(flowerName))
+    if geneCodes not in parentIndexes:
+        parentIndexes[geneCodes] = buildParentIndex(geneCodes)
+    return parentIndexes[geneCodes]
+
+def best_parents(flower, knownFlowers = None, limit = None): #Every pair of flowers that can breed this flower, likeliest first, e.g. best_parents(Flower("Rose", 2, 2, 0, 2))[0]
+    """
+    :param flower: The flower we want to breed
+    :param knownFlowers: Optional KnownFlowerIndex (or any collection of flowers); only pairs where both parents are in it are given
+    :param limit: Optional largest number of pairs to give
+    :return: A list of [ParentA, ParentB, probability of a cross giving this flower as a Fraction], highest probability first
+
+    This is a lookup in the parent index, not a search; only the knownFlowers filter walks the flower's parent list.
+    """
+    parentOffsets, parentPairs, parentCounts = getParentIndex(flower.flowerName)
+    flowerBase = flower.flowerId - flower.GeneIndex
+    found = []
+    for entry in range(parentOffsets[flower.GeneIndex], parentOffsets[flower.GeneIndex + 1]):
+        if limit is not None and len(found) >= limit:
+            break
+        ParentA = Flower.fromId(flowerBase + parentPairs[entry] // GeneCodeCount)
+        ParentB = Flower.fromId(flowerBase + parentPairs[entry] % GeneCodeCount)
+        if knownFlowers is not None and (ParentA not in knownFlowers or ParentB not in knownFlowers):
+            continue
+        found.append([ParentA, ParentB, Fraction(parentCounts[entry], CrossCombinations)])
+    return found
+
+def buildPairColourTable(flowerNumber): #The colours of the children of every pair of gene codes of one flower name
+    """
+    :param flowerNumber: Position of the flower name in flowerList
+    :return: array('H') of 81 * 81 * 9 counts; entry (A*81 + B)*9 + c is how many of the 256 punnett square combinations of gene codes A and B give a child of colour Colours[c].
+    Pairs with a gene code the flower name cannot have are all zero.
+    """
+    offsets, childGenes, childCounts = getCrossTable()
+    colourTable = getColourTable()
+    colourCount = len(Colours)
+    flowerBase = flowerNumber * GeneCodeCount
+    colourCounts = array('H', bytes(2 * colourCount * GeneCodeCount * GeneCodeCount))
+    geneCodes = [gene for gene in range(GeneCodeCount) if colourTable[flowerBase + gene] != NoColour]
+    for geneA in geneCodes:
+        for geneB in geneCodes:
+            pairIndex = geneA * GeneCodeCount + geneB
+            for entry in range(offsets[pairIndex], offsets[pairIndex + 1]):
+                colourCounts[pairIndex * colourCount + colourTable[flowerBase + childGenes[entry]]] += childCounts[entry]
+    return colourCounts
+
+def getPairColourTable(flowerNumber): #buildPairColourTable for one flower name, built on first use and kept
+    if flowerNumber not in pairColourTables:
+        pairColourTables[flowerNumber] = buildPairColourTable(flowerNumber)
+    return pairColourTables[flowerNumber]
+
+BreedBatch = namedtuple("BreedBatch", ["offsets", "childIds", "childCounts", "colourCounts"])
+BreedBatch.__doc__ = """The children of many parent pairs, from breed_many(parentsA, parentsB), as flat arrays with nothing allocated per child.
+ offsets: array('I') of len(pairs) + 1; the children of pair p are entries offsets[p] to offsets[p + 1] of childIds and childCounts
+ childIds: array('I'); flowerId of each child
+ childCounts: array('H'); how many of the 256 punnett square combinations give each child, i.e. its probability out of CrossCombinations
+ colourCounts: array('H') of len(pairs) * 9; colourCounts[p*9 + c] is the count of pair p's children with colour Colours[c]
+ Pairs of different flower names have no children and all zero colour counts, as breed(x,y) gives nothing for them.
+ """
+
+def breed_many(parentsA, parentsB): #breed(x,y) for many pairs at once, taking and giving flowerIds rather than Flowers
+    """
+    :param parentsA, parentsB: Equal length sequences (e.g. arrays or lists) of flowerIds; pair p is parentsA[p] x parentsB[p]
+    :return: A BreedBatch. Children of each pair are in the same order as breed(x,y) gives them.
+    """
+    if len(parentsA) != len(parentsB):
+        raise ValueError("breed_many needs as many second parents as first parents, got " + str(len(parentsA)) + " and " + str(len(parentsB)))
+    crossOffsets, childGenes, crossCounts = getCrossTable()
+    colourCount = len(Colours)
+    offsets = array('I', [0])
+    childIds = array('I')
+    childCounts = array('H')
+    colourCounts = array('H', bytes(2 * colourCount * len(parentsA)))
+    for pair, (flowerIdA, flowerIdB) in enumerate(zip(parentsA, parentsB)):
+        flowerBase = flowerIdA - flowerIdA % GeneCodeCount
+        if flowerIdB - flowerIdB % GeneCodeCount == flowerBase:
+            pairIndex = (flowerIdA - flowerBase) * GeneCodeCount + flowerIdB - flowerBase
+            start = crossOffsets[pairIndex]
+            end = crossOffsets[pairIndex + 1]
+            childIds.extend([flowerBase + gene for gene in childGenes[start:end]])
+            childCounts.extend(crossCounts[start:end])
+            colourCounts[pair * colourCount:(pair + 1) * colourCount] = getPairColourTable(flowerBase // GeneCodeCount)[pairIndex * colourCount:(pairIndex + 1) * colourCount]
+        offsets.append(len(childIds))
+    return BreedBatch(offsets, childIds, childCounts, colourCounts)
+
+def buildPairChildMasks(flowerNumber): #Which children of every pair of gene codes of one flower name are identified by their colour, as gene code bit masks
+    """
+    :param flowerNumber: Position of the flower name in flowerList
+    :return: [identifiedMasks, ambiguousMasks], two lists of 81 * 81 masks. In entry A*81 + B, bit g is set when gene codes A and B can give gene code g (GeneList position),
+    in identifiedMasks when it is the only child of its colour in that cross, and in ambiguousMasks when it shares its colour with another child, as IdentifyFlowersFromBreed splits them.
+    """
+    offsets, childGenes, childCounts = getCrossTable()
+    colourTable = getColourTable()
+    flowerBase = flowerNumber * GeneCodeCount
+    identifiedMasks = [0] * (GeneCodeCount * GeneCodeCount)
+    ambiguousMasks = [0] * (GeneCodeCount * GeneCodeCount)
+    geneCodes = [gene for gene in range(GeneCodeCount) if colourTable[flowerBase + gene] != NoColour]
+    for geneA in geneCodes:
+        for geneB in geneCodes:
+            pairIndex = geneA * GeneCodeCount + geneB
+            colourGenes = {}
+            for entry in range(offsets[pairIndex], offsets[pairIndex + 1]):
+                child = childGenes[entry]
+                colourGenes[colourTable[flowerBase + child]] = colourGenes.get(colourTable[flowerBase + child], 0) | 1 << child
+            for geneMask in colourGenes.values():
+                if geneMask & (geneMask - 1):
+                    ambiguousMasks[pairIndex] |= geneMask
+                else:
+                    identifiedMasks[pairIndex] |= geneMask
+    return [identifiedMasks, ambiguousMasks]
+
+def getPairChildMasks(flowerNumber): #buildPairChildMasks for one flower name, built on first use and kept
+    if flowerNumber not in pairChildMasks:
+        pairChildMasks[flowerNumber] = buildPairChildMasks(flowerNumber)
+    return pairChildMasks[flowerNumber]
+
+CrossBatch = namedtuple("CrossBatch", ["parentsA", "parentsB", "offsets", "childIds", "childCounts", "colourCounts", "identified", "ambiguous"])
+CrossBatch.__doc__ = """The children of every pair of one list of same-named flowers, from crossAllPairs(flowers), as flat arrays.
+ parentsA, parentsB: array('I'); pair p is flowers[parentsA[p]] x flowers[parentsB[p]], with parentsA[p] <= parentsB[p]
+ offsets, childIds, childCounts, colourCounts: the children of each pair, as in BreedBatch
+ identified: list of one gene code bit mask per pair (bit g being GeneList position g); the children that are the only gene code of their colour in that cross
+ ambiguous: list of one gene code bit mask per pair; the children that share their colour with another child, and need a gene test
+ """
+
+def crossAllPairs(flowers, newFrom = 0): #Breeds every pair of a list of same-named flowers (each flower with itself and every later flower) in one call, without making any Flower objects
+    """
+    :param flowers: A list of flowers, all with the same flower name
+    :param newFrom: Only pairs whose later flower is at or after this position in flowers are bred; pairs of earlier flowers were bred in a previous generation
+    :return: A CrossBatch of the children of every pair, and how their colours split them into identified and ambiguous children
+
+    The children come from the cross table (breed_many) and the split from the pair child masks, so this is two lookups per pair.
+    This is for callers that want whole arrays; the solver itself needs Flower dictionaries per pair, so breeds pair by pair (see crossSpecies).
+    """
+    parentsA = array('I')
+    parentsB = array('I')
+    for positionB in range(newFrom, len(flowers)):
+        parentsA.extend(range(positionB + 1))
+        parentsB.extend([positionB] * (positionB + 1))
+    if not flowers:
+        return CrossBatch(parentsA, parentsB, *breed_many([], []), [], [])
+    batch = breed_many([flowers[position].flowerId for position in parentsA], [flowers[position].flowerId for position in parentsB])
+    identifiedMasks, ambiguousMasks = getPairChildMasks(flowers[0].flowerId // GeneCodeCount)
+    pairIndexes = [flowers[positionA].GeneIndex * GeneCodeCount + flowers[positionB].GeneIndex for positionA, positionB in zip(parentsA, parentsB)]
+    return CrossBatch(parentsA, parentsB, *batch, [identifiedMasks[pairIndex] for pairIndex in pairIndexes], [ambiguousMasks[pairIndex] for pairIndex in pairIndexes])
+
+def crossPair(flowerA, flowerB): #breed(x,y) and IdentifyFlowersFromBreed for one pair, remembered in pairOutcomes so no pair is ever worked out twice
+    """
+    :return: [breed(flowerA, flowerB), IdentifyFlowersFromBreed(breed(flowerA, flowerB))]. These are shared between callers, so should not be changed.
+    """
+    pairKey = (flowerA.flowerId, flowerB.flowerId)
+    outcome = pairOutcomes.get(pairKey)
+    if outcome is None:
+        newFlowerPool = breed(flowerA, flowerB)
+        IdentifyedVector = IdentifyFlowersFromBreed(newFlowerPool) if len(newFlowerPool) > 0 else [[], []]
+        outcome = pairOutcomes[pairKey] = [newFlowerPool, IdentifyedVector]
+    return outcome
+
+def crossSpecies(flowers, newFrom = 0): #Breeds every pair of a list of same-named flowers, in the same order as a nested loop over the list
+    """
+    :param flowers: A list of flowers, all with the same flower name
+    :param newFrom: Only pairs involving a flower at or after this position are bred, i.e. the flowers new since the last generation with every flower
+    :return: yields [flowerA, flowerB, breed(flowerA, flowerB), IdentifyFlowersFromBreed(breed(flowerA, flowerB))] for each pair
+
+    Every pair goes through crossPair, so outcomes are kept in pairOutcomes, and pairs already in there are not worked out again.
+    """
+    for position, flowerA in enumerate(flowers):
+        for flowerB in flowers[max(position, newFrom):]:
+            yield [flowerA, flowerB] + crossPair(flowerA, flowerB)
+
+def groupByColour(flowers): #Sorts flowers into lists by colour in one pass
+    """
+    :param flowers: Any iterable of flowers, e.g. the output of breed(x,y)
+    :return: {colour: [flowers of this colour, in the order given]}, with colours in the order they first appear
+    """
+    colourGroups = {}
+    for flower in flowers:
+        colour = flower.colour
+        if colour in colourGroups:
+            colourGroups[colour].append(flower)
+        else:
+            colourGroups[colour] = [flower]
+    return colourGroups
+
 def IdentifyFlowersFromBreed(breed_list): # Takes output from breed(x,y) and outputs flowers we can identify directly because it is a unique geneome with a unique colour, and also groups the flowers we cannot identify because multiple genomes share a colour.
     #e.g. If a white x white flower combo gives one pink flower and 2 white flowers, then the output will be like [ [pink_flower], [[white_flowers, "White"]]]
     """
-    :param breed_list: Breed list is provided by the breed function. it is a dictionary of the form: {child_flower: {Probability: n%, Parents: [ParentA, ParentB]}}
+    :param breed_list: Breed list is provided by the breed function. it is a dictionary of the form: {child_flower: {Count: n, Parents: [ParentA, ParentB]}}
     :return: [[successful flowers], [[failed flowers], colour the failed flowers share]]
         e.g. [[successfully identified green flower],[successfully identified pink flower]],[[[unidentified purple flowers],purple],[[unidentified blue flowers],blue]]
+
+    One pass groups the children by colour; a colour with one child identifies it. Each failed group lists its flowers with the first-bred one last.
     """
-    output = []
-    successList = []
-    allfails = []
-    failedOutput = []
-    if len(breed_list) < 2:
-        successList.append(list(breed_list)[0])
-    else:
-        for flowerE in list(breed_list):
-            failedList = []
-            Efailed = False
-            testColour = flowerE.colour
-            for flowerF in list(breed_list)[list(breed_list).index(flowerE)+1:]:
-                if flowerF.colour == testColour and flowerF not in allfails:
-                    Efailed = True
-                    failedList.append(flowerF)
-                    allfails.append(flowerF)
-            if Efailed:
-                allfails.append(flowerE)
-                failedList.append(flowerE)
-            if len(failedList) > 0:
-                failedOutput.append([failedList, testColour])
-        for flowerG in breed_list:
-            if flowerG not in allfails:
-                successList.append(flowerG)
-    output = [successList, failedOutput]
-    return output
+    colourGroups = groupByColour(breed_list)
+    successList = [flower for flower in breed_list if len(colourGroups[flower.colour]) == 1]
+    failedOutput = [[group[1:] + group[:1], colour] for colour, group in colourGroups.items() if len(group) > 1]
+    return [successList, failedOutput]
 
 def calculateTest(test): #Takes a [known_flower]x[unknown_flowers] test, and compares the children. It outputs all children which produce unique colours from this test and associates it with its unknown parent.
     #This way, a unknown flower can be immediately identified when it produces one of these coloured children.
     """
-    :param test: {unidentified flowers : {Potential colours : {Flowers : [flowers of this colour], Probability: n% probability of getting this colour} }
-    :return: {unidentified flowers : {UNIQUE colours : {Flowers : [flowers of this colour], Probability: n% probability of getting this colour} }
+    :param test: {unidentified flowers : {Potential colours : {Flowers : [flowers of this colour], Count: chance of getting this colour, out of CrossCombinations} }
+    :return: {unidentified flowers : {UNIQUE colours : {Flowers : [flowers of this colour], Count: chance of getting this colour, out of CrossCombinations} }
 
     The Goal of this function is to compare the colour tables of the input dictionaries and remove any colour shared by more than one flower.
     This gives a list of children whos occurence in a Gene test tell us the unidentified flower is of a specific geneome.
+    Each unidentified flower's colours are a 9 bit mask (bit n is Colours[n]); a colour is unique when its bit is not in sharedColourMask of those masks.
     """
-    AllColours = []
+    shared = sharedColourMask([sum(ColourBits[colour] for colour in test[testChild]) for testChild in test])
     TestOutputs = {}
     for testChild in test:
-        UniqueChildColours = []
-        OutsideColourList = []
-        testChildColourList = []
-        for colour in test[testChild]:
-            testChildColourList.append(colour) #gets all colours this test combo can produce
-            AllColours.append(colour) #gives all colours to system
-        for otherChild in test:
-            if otherChild != testChild:
-                for colour in test[otherChild]:
-                    OutsideColourList.append(colour)
-        for colour in testChildColourList:
-            if colour not in OutsideColourList:
-                UniqueChildColours.append(colour)
-        TestOutputs[testChild] = {}
-        for colour in UniqueChildColours:
-            TestOutputs[testChild][colour] = {}
-        for colour in UniqueChildColours:
-            TestOutputs[testChild][colour] = test[testChild][colour]
+        TestOutputs[testChild] = {colour: test[testChild][colour] for colour in test[testChild] if not ColourBits[colour] & shared}
     return TestOutputs
 
+def sharedColourMask(colourMasks): #The colours (as a bit mask, bit n being Colours[n]) that are in more than one of a list of colour masks
+    seen = 0
+    shared = 0
+    for colourMask in colourMasks:
+        shared |= seen & colourMask
+        seen |= colourMask
+    return shared
+
+def buildPairColourMasks(flowerNumber): #The colours of the children of every pair of gene codes of one flower name, as bit masks
+    """
+    :param flowerNumber: Position of the flower name in flowerList
+    :return: array('H') of 81 * 81 masks; entry A*81 + B has bit n set when gene codes A and B can give a child of colour Colours[n]
+    """
+    colourTable = getPairColourTable(flowerNumber)
+    colourCount = len(Colours)
+    colourMasks = array('H', bytes(2 * GeneCodeCount * GeneCodeCount))
+    for pairIndex in range(GeneCodeCount * GeneCodeCount):
+        colourMask = 0
+        for colourNumber in range(colourCount):
+            if colourTable[pairIndex * colourCount + colourNumber]:
+                colourMask |= 1 << colourNumber
+        colourMasks[pairIndex] = colourMask
+    return colourMasks
+
+def getPairColourMasks(flowerNumber): #buildPairColourMasks for one flower name, built on first use and kept
+    if flowerNumber not in pairColourMasks:
+        pairColourMasks[flowerNumber] = buildPairColourMasks(flowerNumber)
+    return pairColourMasks[flowerNumber]
+
+def distinguishingPartners(candidates, testFlowers): #The test flowers that give at least one of the candidates a colour none of the others can give, i.e. that can identify something by a gene test
+    """
+    :param candidates: Unidentified flowers of one flower name
+    :param testFlowers: Known flowers of the same name to try
+    :return: A list of the test flowers that can identify a candidate, in testFlowers order
+
+    Which gene codes can tell the candidates apart is worked out once per group by distinguishingGenes, so this is a bit test per test flower.
+    """
+    candidates = frozenset(candidates)
+    if not candidates:
+        return []
+    geneMask = distinguishingGenes(candidates)
+    return [testFlower for testFlower in testFlowers if geneMask >> testFlower.GeneIndex & 1]
+
+@functools.lru_cache(maxsize=4096)
+def distinguishingGenes(candidates): #Every gene code a test flower could have that can identify one of a frozenset of candidates, as a GeneList bit mask. Remembered per group, like geneTestResult.
+    """
+    Only the pair colour masks are looked at, so nothing is bred; geneTestResult of a test flower outside the mask would find no unique colours.
+    The answer only depends on the candidates, so groups that come up again, in later generations or later solves in this process, are a lookup.
+    """
+    candidates = list(candidates)
+    flowerName = candidates[0].flowerName
+    colourMasks = getPairColourMasks(flowerNumbers[flowerName])
+    candidateRows = [candidate.GeneIndex * GeneCodeCount for candidate in candidates]
+    geneMask = 0
+    for testGene in flowerGeneCodes(flowerName):
+        testMasks = [colourMasks[candidateRow + testGene] for candidateRow in candidateRows]
+        shared = sharedColourMask(testMasks)
+        if any(testMask & ~shared for testMask in testMasks):
+            geneMask |= 1 << testGene
+    return geneMask
+
+@functools.lru_cache(maxsize=16384)
+def potentialColours(flowerA, flowerB): #Groups the children of two flowers by colour. Remembered per pair, like crossPair.
+    """
+    :param flowerA, flowerB: parent flowers
+    :return: {colour: {"Flowers": [children of this colour], "Count": chance of getting this colour, out of CrossCombinations}}
+    This is shared between callers, so should not be changed.
+    """
+    colourGroups = {}
+    newFlowerPool = crossPair(flowerA, flowerB)[0]
+    for flower in newFlowerPool:
+        if flower.colour not in colourGroups:
+            colourGroups[flower.colour] = {}
+            colourGroups[flower.colour]["Flowers"] = []
+            colourGroups[flower.colour]["Count"] = 0
+        colourGroups[flower.colour]["Flowers"].append(flower)
+        colourGroups[flower.colour]["Count"] += newFlowerPool[flower]["Count"]
+    return colourGroups
+
+@functools.lru_cache(maxsize=4096)
+def geneTestResult(testFlower, candidates): #Gene tests a group of unidentified flowers against one known flower. Remembers the most recent 4096 (test flower, group) results.
+    """
+    :param testFlower: A known flower to breed each candidate with
+    :param candidates: A frozenset of the unidentified flowers (same name as testFlower) that share a colour
+    :return: calculateTest of the test, i.e. {candidate : {UNIQUE colours : {Flowers : [flowers of this colour], Count: chance of getting this colour, out of CrossCombinations} }
+    This is shared between callers, so should not be changed.
+
+    The same groups get tested against the same known flowers every time gene tests are tried, so the result is cached by (test flower, candidates).
+    geneTestResult.cache_info() gives the hit and miss counts.
+    """
+    test = {}
+    for flowerA in candidates:
+        colourGroups = potentialColours(flowerA, testFlower)
+        if len(colourGroups) > 0:
+            test[flowerA] = colourGroups
+    return calculateTest(test)
+
+class KnownFlowerIndex(object):
+    """A list of known flowers which also keeps track of which flowers are in it, so checking a flower is O(1) rather than a walk through the list.
+     Flowers are keyed by their flowerId, i.e. by flower name and gene code together, and each flower is only ever added once.
+
+     Internals:
+     flowers; all known flowers, in the order they were added
+     positions; flowerId : position of that flower in flowers
+     speciesFlowers; flower name : list of known flowers of that name, in the order they were added
+     """
+    def __init__(self, flowers = ()):
+        self.flowers = []
+        self.positions = {}
+        self.speciesFlowers = {}
+        for flower in flowers:
+            self.append(flower)
+
+    def append(self, flower): #Adds a flower to the end of the index, unless an identical flower is already known
+        if flower.flowerId not in self.positions:
+            self.positions[flower.flowerId] = len(self.flowers)
+            self.flowers.append(flower)
+            self.speciesFlowers.setdefault(flower.flowerName, []).append(flower)
+
+    def species(self, flowerName): #All known flowers of one flower name, in the order they were added
+        return self.speciesFlowers.get(flowerName, [])
+
+    def index(self, flower):
+        return self.positions[flower.flowerId]
+
+    def __contains__(self, flower):
+        return flower.flowerId in self.positions
+
+    def __getitem__(self, item):
+        return self.flowers[item]
+
+    def __iter__(self):
+        return iter(self.flowers)
+
+    def __len__(self):
+        return len(self.flowers)
+
 def IsFlowerNotDiscovered(testFlower, knownFlowerList): #Takes a flower and the list of geneomed flowers and tells you whether the flower has been previously discovered. Saves on duplicate entries.
     """
     :param testFlower: A flower object to compare to entries in knownFlowerList
-    :param knownFlowerList: A list of Flowers with known genetic make up
-    :return: A boolean saying whether testFlower, or an identically gened flower, is in knownFlowerList, since different instances of flower objects with the same internal parameters are not identical.
+    :param knownFlowerList: A KnownFlowerIndex (or list) of Flowers with known genetic make up
+    :return: A boolean saying whether testFlower, or an identically gened flower, is missing from knownFlowerList. An empty knownFlowerList has not discovered anything.
     """
+    return testFlower not in knownFlowerList
 
-    output = False
-    if len(knownFlowerList) > 0:
-        output = True
+def addIdentifiedFlower(IdentifiedFlowers, flower, identification): #Adds one way of getting a flower to IdentifiedFlowers, keeping whichever of it and any way already there commitDiscoveries would choose
+    """
+    :param IdentifiedFlowers: As for BreedNewFlowers and IdentifyUngenedFlowers
+    :param flower: The flower this way gets
+    :param identification: {"Count": n, "Parents": [ParentA, ParentB], "ID": reason} plus, for a gene test, "Test Flower": {test flower: {"Count": n, "Colours": [...]}}
+    :return: None
 
-    for flowerX in knownFlowerList:
-        if (testFlower.GeneCode == flowerX.GeneCode) and (testFlower.flowerName == flowerX.flowerName):
-            output = False
+    Flowers are interned, so every pair that breeds a gene code gives the same flower, and IdentifiedFlowers can only hold one way of getting it.
+    Rather than the last pair tried replacing the rest, the better of the two is kept, by the same rules commitDiscoveries uses:
+    no gene test beats a gene test, then the higher breeding count, then (between gene tests) the higher count of the best test; the earlier wins a tie.
+    Gene tests of the same group (same parents) with different test flowers are merged, so every test flower survives for commitDiscoveries to choose from.
+    """
+    geneFlowers = IdentifiedFlowers[flower.flowerName].setdefault(flower.GeneCode, {})
+    current = geneFlowers.get(flower)
+    if current is None:
+        geneFlowers[flower] = identification
+        return
+    if current["ID"] == IdentificationReasons[2] and identification["ID"] == IdentificationReasons[2] and current["Parents"] == identification["Parents"]:
+        for testFlower in identification["Test Flower"]:
+            current["Test Flower"].setdefault(testFlower, identification["Test Flower"][testFlower])
+        return
+    if identificationRank(identification) > identificationRank(current):
+        geneFlowers[flower] = identification
 
-    return output
+def identificationRank(identification): #How commitDiscoveries orders ways of getting a flower: no gene test first, then breeding count, then best test count
+    isGeneTest = identification["ID"] == IdentificationReasons[2]
+    return (not isGeneTest, identification["Count"], max(test["Count"] for test in identification["Test Flower"].values()) if isGeneTest else 0)
 
-def IdentifyUngenedFlowers(ungenedFlowers, IdentifiedFlowers): #A repeatable function that takes in groups of ungened flowers, and performs gene tests on the group to see if there are any ways to identify them.
-    #Ungened flowers is a list of dictionaries, Identified flowers is the dictionary of potential additions to the list of geneomed flowers.
+def IdentifyUngenedFlowers(ungenedFlowers, IdentifiedFlowers, UpdatedFlowerPool): #A repeatable function that takes in groups of ungened flowers, and performs gene tests on the group to see if there are any ways to identify them.
+    #Ungened flowers is a dictionary of test groups, Identified flowers is the dictionary of potential additions to the list of geneomed flowers.
     """
-    :param ungenedFlowers: Takes a list of dictionaries, with each dictionary being a test group of similar colour but different genes.
+    :param ungenedFlowers: Takes a dictionary of test groups, keyed by (ParentA flowerId, ParentB flowerId, colour), with each entry being a test group of similar colour but different genes.
+    Groups whose flowers are all known already are skipped.
     :param IdentifiedFlowers: An output vector which is a dictionary of all flowers which have possible ID methods on this iteration of the program. Formatted:
     IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["Test Flower"][test]["Colours"] = [colour for colour in interpretResults[geneTest]]
     {Flower Name: {Gene Code: {Individual Flower objects:
-    {"probability": n%, "Parents": [ParentA, ParentB], "ID": "Unique Genome/ Colour/ Gene Test",
-     "Test Flower": { Test Partner Flower Object: {"Colours": [Successful-test colours] , "Probability" : n% propability of a successful test}}}}}
+    {"Count": chance of breeding it out of CrossCombinations, "Parents": [ParentA, ParentB], "ID": "Unique Genome/ Colour/ Gene Test",
+     "Test Flower": { Test Partner Flower Object: {"Colours": [Successful-test colours] , "Count" : chance of a successful test out of CrossCombinations}}}}}
+    :param UpdatedFlowerPool: The KnownFlowerIndex of all known flowers, which are tried as test partners for flowers of the same name
     :return: None
 
     This function breeds every flower on the known flower list with unknown flowers. It then looks for uniquely coloured flowers which occur for any one flower
@@ -221,36 +640,24 @@ def IdentifyUngenedFlowers(ungenedFlowers, IdentifiedFlowers): #A repeatable fun
 
     Note: This function draws a lot of computing power for large Known Flower List sizes. Optimisaton should be focused here.
     Also: We might want to adjust the method of this function to allow deductive reasoning on failed tests, but this deductive logic is annoying to think about.
+    GeneTestPlanner does this reasoning for a single group, over several rounds of tests.
 
     E.g. If two white roses breed to give three different white roses, and one is ID'ed by a successful gene test,
     if the test is negative then it should imply it is one of the other two white flowers.
     Hopefully we can find a test with these two that identifies them.
     """
-    for unidentifiedPool in ungenedFlowers:
-        testResults = {}
-        for flowerB in UpdatedFlowerPool:
-            test = {}
-            for flowerA in unidentifiedPool["Flowers"]:
-                if flowerB.flowerName == flowerA.flowerName:
-                    #print("--")
-                    #print("New Test Flower")
-                    potentialColours = {}
-                    newFlowerPool = breed(flowerA, flowerB)
-                    if len(newFlowerPool) > 0:
-                        for flower in newFlowerPool:
-                            potentialColours[flower.colour] = {}
-                            potentialColours[flower.colour]["Flowers"] = []
-                            potentialColours[flower.colour]["Probability"] = 0.0
-                        for flower in newFlowerPool:
-                            potentialColours[flower.colour]["Flowers"].append(flower)
-                            potentialColours[flower.colour]["Probability"] += newFlowerPool[flower]["Probability"]
-                        test[flowerA] = potentialColours
-            if len(test) > 0:
-                testResults[flowerB] = {}
-                testResults[flowerB] = test
-        for test in testResults:
+    for unidentifiedPool in ungenedFlowers.values():
+        if not any(IsFlowerNotDiscovered(flower, UpdatedFlowerPool) for flower in unidentifiedPool["Flowers"]):
+            continue
+        candidates = frozenset(unidentifiedPool["Flowers"])
+        flowerName = next(iter(candidates)).flowerName
+        #A test with a partner tried on an earlier pass has already had every flower it identifies discovered, so only the newer partners are tried
+        partners = UpdatedFlowerPool.species(flowerName)
+        testedFrom = unidentifiedPool.get("Tested", 0)
+        unidentifiedPool["Tested"] = len(partners)
+        for test in distinguishingPartners(candidates, partners[testedFrom:]):
             #print(test)
-            interpretResults = calculateTest(testResults[test])
+            interpretResults = geneTestResult(test, candidates)
             #print(interpretResults)
             """print(
                 interpretResults[1][0][0].colour + " children, of "
@@ -261,7 +668,7 @@ def IdentifyUngenedFlowers(ungenedFlowers, IdentifiedFlowers): #A repeatable fun
             )"""
             for geneTest in interpretResults:
                 #print(geneTest)
-                if len(interpretResults[geneTest]) > 0:
+                if len(interpretResults[geneTest]) > 0 and IsFlowerNotDiscovered(geneTest, UpdatedFlowerPool):
                     """print(geneTest[0].colour + " " + geneTest[0].flowerName + " (" + geneTest[0].GeneCode
                     + ") children of "
                + interpretResults[3].colour + " " +  interpretResults[3].flowerName + "s (" + interpretResults[3].GeneCode + ") and "
@@ -270,41 +677,40 @@ def IdentifyUngenedFlowers(ungenedFlowers, IdentifiedFlowers): #A repeatable fun
                     + interpretResults[0].colour + " " +  interpretResults[0].flowerName + " (" + interpretResults[0].GeneCode + ") "
                     + "out of a colour pool of " + ", ".join(map(str,interpretResults[2])))"""
 
-                    TestSuccessProbability = 0.0
+                    TestSuccessCount = 0
                     for colour in interpretResults[geneTest]:
-                        TestSuccessProbability += interpretResults[geneTest][colour]["Probability"]
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode] = {}
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest] = {}
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["Probability"] = \
-                    unidentifiedPool["Flowers"][geneTest]
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["Parents"] = unidentifiedPool["Parents"]
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["ID"] = IdentificationReasons[2]
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["Test Flower"] = {}
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["Test Flower"][test] = {}
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["Test Flower"][test]["Probability"] = TestSuccessProbability
-                    IdentifiedFlowers[geneTest.flowerName][geneTest.GeneCode][geneTest]["Test Flower"][test]["Colours"] = [colour for colour in interpretResults[geneTest]]
+                        TestSuccessCount += interpretResults[geneTest][colour]["Count"]
+                    addIdentifiedFlower(IdentifiedFlowers, geneTest, {"Count": unidentifiedPool["Flowers"][geneTest], "Parents": unidentifiedPool["Parents"], "ID": IdentificationReasons[2],
+                                                                      "Test Flower": {test: {"Count": TestSuccessCount, "Colours": [colour for colour in interpretResults[geneTest]]}}})
     ungenedFlowers = []
 
-def BreedNewFlowers(UpdatedFlowerPool, IdentifiedFlowers):
+def BreedNewFlowers(UpdatedFlowerPool, IdentifiedFlowers, UngenedflowerPool, crossedFlowers = None):
     """
-    :param UpdatedFlowerPool: A list of all known flowers in the form of flower objects
+    :param UpdatedFlowerPool: A KnownFlowerIndex of all known flowers in the form of flower objects
     :param IdentifiedFlowers: a dictionary of all flowers that can be identified on this iteration of the process. Intended as an output file to append new entries to in this function
+    :param UngenedflowerPool: A dictionary of groups of flowers that share a colour, which gene tests may later tell apart, keyed by (ParentA flowerId, ParentB flowerId, colour). Also an output file; a group already in there is not added again.
+    IdentifyUngenedFlowers keeps a "Tested" count on each group of how many known flowers of that name it has already been tested with.
+    :param crossedFlowers: Optional {flower name: number of flowers of that name already bred with each other}. When given, only pairs involving a newer flower are bred,
+    and the counts are moved up to the current pool size. Pairs of older flowers have already had their children identified or grouped in an earlier generation.
     :return: None
 
 
     Identified flowers looks like: {Flower Name: {Gene Code: {Individual Flower objects:
-    {"probability": n%, "Parents": [ParentA, ParentB], "ID": "Unique Genome/ Colour/ Gene Test",
-     "Test Flower": { Test Partner Flower Object: {"Colours": [Successful-test colours] , "Probability" : n% propability of a successful test}}}}}
+    {"Count": chance of breeding it out of CrossCombinations, "Parents": [ParentA, ParentB], "ID": "Unique Genome/ Colour/ Gene Test",
+     "Test Flower": { Test Partner Flower Object: {"Colours": [Successful-test colours] , "Count" : chance of a successful test out of CrossCombinations}}}}}
 
-    Takes the list of all known-gene flowers, breeds them together. Any that can be identified immediately are appended to the dictionary Identify flowers,
+    Takes the list of all known-gene flowers, breeds each flower name together (flowers of different names never breed). Any that can be identified immediately are appended to the dictionary Identify flowers,
     the flowers that cannot be identified immediately are appended to the list UngenedflowerPool,
-     as a dictionary each failed colour, the flowers which occur in that colour, and the probability of getting each (flower/colour?)
+     as a dictionary each failed colour, the flowers which occur in that colour, and the count (out of CrossCombinations) of getting each (flower/colour?)
     """
-    for flowerA in UpdatedFlowerPool:
-        for flowerB in UpdatedFlowerPool[UpdatedFlowerPool.index(flowerA):]:
-            newFlowerPool = breed(flowerA, flowerB)
+    for flowerName in flowerList:
+        speciesFlowers = UpdatedFlowerPool.species(flowerName)
+        newFrom = 0
+        if crossedFlowers is not None:
+            newFrom = crossedFlowers.get(flowerName, 0)
+            crossedFlowers[flowerName] = len(speciesFlowers)
+        for flowerA, flowerB, newFlowerPool, IdentifyedVector in crossSpecies(speciesFlowers, newFrom):
             if len(newFlowerPool) > 0:
-                IdentifyedVector = IdentifyFlowersFromBreed(newFlowerPool)
                 reason = ""
                 isThisAnUpdate = ""
                 if len(newFlowerPool) < 2:
@@ -314,398 +720,920 @@ def BreedNewFlowers(UpdatedFlowerPool, IdentifiedFlowers):
                 for flower in IdentifyedVector[0]:
                     if IsFlowerNotDiscovered(flower, UpdatedFlowerPool):
                         #ColourProbabilities = CalculateColourProbabilities(newFlowerPool)
-                        IdentifiedFlowers[flower.flowerName][flower.GeneCode] = {}
-                        IdentifiedFlowers[flower.flowerName][flower.GeneCode][flower] = {}
-                        IdentifiedFlowers[flower.flowerName][flower.GeneCode][flower]["Probability"] =  newFlowerPool[flower]["Probability"]
-                        IdentifiedFlowers[flower.flowerName][flower.GeneCode][flower]["Parents"] = [flowerA, flowerB]
-                        IdentifiedFlowers[flower.flowerName][flower.GeneCode][flower]["ID"] = reason
+                        addIdentifiedFlower(IdentifiedFlowers, flower, {"Count": newFlowerPool[flower]["Count"], "Parents": [flowerA, flowerB], "ID": reason})
                         """print("A " + flower.colour + " " + flower.flowerName +
                               " (" + flower.GeneCode + ") was the child of a "
                               + flowerA.colour + " " + flowerA.flowerName + " ("+ flowerA.GeneCode + ") and a "
                               + flowerB.colour + " " + flowerB.flowerName +" ("+ flowerB.GeneCode +
-                              ") and was identified by " + reason + ". " + str(newFlowerPool[flower]["Probability"]))"""
+                              ") and was identified by " + reason + ". " + str(newFlowerPool[flower]["Count"]))"""
 
                 for failedGrouping in IdentifyedVector[1]:
+                    groupKey = (flowerA.flowerId, flowerB.flowerId, failedGrouping[1])
+                    if groupKey in UngenedflowerPool:
+                        continue
                     failedDictionary = {}
                     failedDictionary["Flowers"] = {}
                     for flower in failedGrouping[0]:
-                        failedDictionary["Flowers"][flower] = newFlowerPool[flower]["Probability"]
+                        failedDictionary["Flowers"][flower] = newFlowerPool[flower]["Count"]
                     failedDictionary["Colour"] = failedGrouping[1]
                     failedDictionary["Parents"] = newFlowerPool[flower]["Parents"]
-                    UngenedflowerPool.append(failedDictionary)
+                    UngenedflowerPool[groupKey] = failedDictionary
+
+Discovery = namedtuple("Discovery", ["flower", "parents", "probability", "ID", "testFlower", "testColours", "testProbability", "generation"])
+Discovery.__doc__ = """One flower the solver has found and added to the known pool, with how to breed and identify it.
+ flower; the Flower found
+ parents; [ParentA, ParentB] to breed it from
+ probability; chance of a cross of the parents giving this flower, as a Fraction
+ ID; how it is identified, from IdentificationReasons
+ testFlower; the known flower to gene test it with, or None if no gene test is needed
+ testColours; the test colours that identify it (empty if no gene test is needed)
+ testProbability; chance of a test cross giving one of those colours, as a Fraction (None if no gene test is needed)
+ generation; the generation (from 0) of its flower name's solve it was found in, or None if not known
+"""
 
-def SaveFlowers(UpdatedFlowerPool, IdentifiedFlowers):
+def commitDiscoveries(UpdatedFlowerPool, IdentifiedFlowers, generation = None): #Chooses the best way to get each new flower in IdentifiedFlowers, adds those flowers to UpdatedFlowerPool and returns a Discovery for each
     """
-    :param UpdatedFlowerPool: The list of all known flowers. Used both as an output file to append entries too, and a comparison point so no duplicate entries are attempted.
+    :param UpdatedFlowerPool: The KnownFlowerIndex of all known flowers. Used both as an output file to append entries too, and a comparison point so no duplicate entries are attempted.
 
     :param IdentifiedFlowers: The dictionary of all flowers which we can identify on this iteration of the program.
      Identified flowers looks like: {Flower Name: {Gene Code: {Individual Flower objects:
-    {"probability": n%, "Parents": [ParentA, ParentB], "ID": "Unique Genome/ Colour/ Gene Test",
-     "Test Flower": { Test Partner Flower Object: {"Colours": [Successful-test colours] , "Probability" : n% propability of a successful test}}}}}
+    {"Count": chance of breeding it out of CrossCombinations, "Parents": [ParentA, ParentB], "ID": "Unique Genome/ Colour/ Gene Test",
+     "Test Flower": { Test Partner Flower Object: {"Colours": [Successful-test colours] , "Count" : chance of a successful test out of CrossCombinations}}}}}
 
-    :return: A boolean on whether a new flower was added to the known flower pool.
+    :param generation: Generation number to put in each Discovery
+
+    :return: A list of Discovery, one per flower added to UpdatedFlowerPool, in the order they were added.
 
     Takes the flowers we can identify, and finds the best parent combo to use to find said flower. This should prioritise breeding pairs that directly breed the desired flower
      over any that need to be gene IDed.
-    It also prints in text the appropriate parent combo, with some probabilities and how to test for said flower.
     """
-    output = False
+    discoveries = []
     for flowerName in IdentifiedFlowers:
          for Gene in IdentifiedFlowers[flowerName]:
              flowerToSave = "Dummy"
              NeedsIDed = True
-             maxProb = 0.0
-             maxIDProb = 0.0
+             maxCount = 0
+             maxIDCount = 0
              IDFlower = ""
-             AdditionalReason = ""
              for flower in IdentifiedFlowers[flowerName][Gene]:
                 if IsFlowerNotDiscovered(flower, UpdatedFlowerPool):
-                    output = True
                     if NeedsIDed and IdentifiedFlowers[flowerName][Gene][flower]["ID"] == IdentificationReasons[2]:
-                        maxIDProbThisFlower = 0.0 #assigns a new target flow amoung flowers that MUST be identified through gene tests
-                        MaxProbIDFlower = None
+                        maxIDCountThisFlower = 0 #assigns a new target flow amoung flowers that MUST be identified through gene tests
+                        MaxCountIDFlower = None
                         for testFlower in IdentifiedFlowers[flowerName][Gene][flower]["Test Flower"]: #Gets MaxID chance & associated flower
-                            if IdentifiedFlowers[flowerName][Gene][flower]["Test Flower"][testFlower]["Probability"] > maxIDProbThisFlower:
-                                maxIDProbThisFlower = IdentifiedFlowers[flowerName][Gene][flower]["Test Flower"][testFlower]["Probability"]
-                                MaxProbIDFlower = testFlower
-                        if IdentifiedFlowers[flowerName][Gene][flower]["Probability"] > maxProb: #If the new flower is easier to breed, the new flower will be our target
-                            maxProb = IdentifiedFlowers[flowerName][Gene][flower]["Probability"]
+                            if IdentifiedFlowers[flowerName][Gene][flower]["Test Flower"][testFlower]["Count"] > maxIDCountThisFlower:
+                                maxIDCountThisFlower = IdentifiedFlowers[flowerName][Gene][flower]["Test Flower"][testFlower]["Count"]
+                                MaxCountIDFlower = testFlower
+                        if IdentifiedFlowers[flowerName][Gene][flower]["Count"] > maxCount: #If the new flower is easier to breed, the new flower will be our target
+                            maxCount = IdentifiedFlowers[flowerName][Gene][flower]["Count"]
                             flowerToSave = flower
-                            maxIDProb = maxIDProbThisFlower
-                            IDFlower = MaxProbIDFlower
-                        elif(IdentifiedFlowers[flowerName][Gene][flower]["Probability"] == maxProb and maxIDProbThisFlower > maxIDProb):
+                            maxIDCount = maxIDCountThisFlower
+                            IDFlower = MaxCountIDFlower
+                        elif(IdentifiedFlowers[flowerName][Gene][flower]["Count"] == maxCount and maxIDCountThisFlower > maxIDCount):
                             flowerToSave = flower #If the new flower is easier to Identify, this new flower will be our target
-                            maxIDProb = maxIDProbThisFlower
-                            IDFlower = MaxProbIDFlower
+                            maxIDCount = maxIDCountThisFlower
+                            IDFlower = MaxCountIDFlower
                     else:
                         if NeedsIDed: #When we can avoid gene tests, we no long check gene test flowers
                             NeedsIDed = False
-                            maxProb = 0.0
-                        if IdentifiedFlowers[flowerName][Gene][flower]["Probability"] > maxProb: #If the new flower is easier to breed, the new flower is our new target
-                            maxProb = IdentifiedFlowers[flowerName][Gene][flower]["Probability"]
+                            maxCount = 0
+                        if IdentifiedFlowers[flowerName][Gene][flower]["Count"] > maxCount: #If the new flower is easier to breed, the new flower is our new target
+                            maxCount = IdentifiedFlowers[flowerName][Gene][flower]["Count"]
                             flowerToSave = flower
              if(flowerToSave != "Dummy"):
+                 saved = IdentifiedFlowers[flowerName][Gene][flowerToSave]
                  if NeedsIDed and IDFlower != "":
-                     AdditionalReason = "This flower is successfully Identified by breeding it with a " + IDFlower.colour + " "\
-                     + IDFlower.flowerName + " (" + IDFlower.GeneCode + ") and getting children of the following colours: "\
-                     + ", ".join(map(str,IdentifiedFlowers[flowerName][Gene][flowerToSave]["Test Flower"][IDFlower]["Colours"])) \
-                     + ". These occur with a chance of " + str(maxIDProb)
-                 print("A " + flowerToSave.colour + " " + flowerToSave.flowerName + " (" + flowerToSave.GeneCode + ") should be bred from a "
-                 + IdentifiedFlowers[flowerName][Gene][flowerToSave]["Parents"][0].colour
-                 + " " + IdentifiedFlowers[flowerName][Gene][flowerToSave]["Parents"][0].flowerName
-                 + " (" + IdentifiedFlowers[flowerName][Gene][flowerToSave]["Parents"][0].GeneCode + ") and a "
-                 + IdentifiedFlowers[flowerName][Gene][flowerToSave]["Parents"][1].colour
-                 + " " + IdentifiedFlowers[flowerName][Gene][flowerToSave]["Parents"][1].flowerName
-                 + " (" + IdentifiedFlowers[flowerName][Gene][flowerToSave]["Parents"][1].GeneCode + "). It has a " + str(maxProb)
-                 + " chance of being bred. It can be identified by "
-                 +   IdentifiedFlowers[flowerName][Gene][flowerToSave]["ID"] + ". " + AdditionalReason   )
+                     discoveries.append(Discovery(flowerToSave, list(saved["Parents"]), Fraction(maxCount, CrossCombinations), saved["ID"],
+                                                  IDFlower, list(saved["Test Flower"][IDFlower]["Colours"]), Fraction(maxIDCount, CrossCombinations), generation))
+                 else:
+                     discoveries.append(Discovery(flowerToSave, list(saved["Parents"]), Fraction(maxCount, CrossCombinations), saved["ID"], None, [], None, generation))
                  UpdatedFlowerPool.append(flowerToSave)
-    return output
+    return discoveries
+
+def discoveryText(discovery): #The breeding route text for one Discovery, e.g. "A White Cosmo (rrYyWWbb) should be bred from a White Cosmo (rryyWwbb) and a ..."
+    flower = discovery.flower
+    ParentA, ParentB = discovery.parents
+    AdditionalReason = ""
+    if discovery.testFlower is not None:
+        AdditionalReason = "This flower is successfully Identified by breeding it with a " + discovery.testFlower.colour + " "\
+        + discovery.testFlower.flowerName + " (" + discovery.testFlower.GeneCode + ") and getting children of the following colours: "\
+        + ", ".join(map(str, discovery.testColours)) \
+        + ". These occur with a chance of " + str(float(discovery.testProbability))
+    return ("A " + flower.colour + " " + flower.flowerName + " (" + flower.GeneCode + ") should be bred from a "
+    + ParentA.colour + " " + ParentA.flowerName + " (" + ParentA.GeneCode + ") and a "
+    + ParentB.colour + " " + ParentB.flowerName + " (" + ParentB.GeneCode + "). It has a " + str(float(discovery.probability))
+    + " chance of being bred. It can be identified by "
+    +   discovery.ID + ". " + AdditionalReason   )
+
+def recordDiscovery(discovery, breedingRoute = None, geneTestRecords = None): #Adds a Discovery's text to breedingRoute (or prints it), and its gene test to geneTestRecords, as SaveFlowers describes
+    if discovery.testFlower is not None and geneTestRecords is not None:
+        geneTestRecords.append([discovery.flower, discovery.testFlower, list(discovery.testColours), discovery.testProbability])
+    if breedingRoute is None:
+        print(discoveryText(discovery))
+    else:
+        breedingRoute.append(discoveryText(discovery))
+
+def SaveFlowers(UpdatedFlowerPool, IdentifiedFlowers, breedingRoute = None, geneTestRecords = None):
+    """
+    :param UpdatedFlowerPool: The KnownFlowerIndex of all known flowers. Used both as an output file to append entries too, and a comparison point so no duplicate entries are attempted.
+
+    :param IdentifiedFlowers: The dictionary of all flowers which we can identify on this iteration of the program (see commitDiscoveries).
+
+    :param breedingRoute: Optional list that the text for each saved flower is appended to. If it is not given, the text is printed instead.
+
+    :param geneTestRecords: Optional list that [saved flower, test flower, [successful test colours], probability of a successful test as a Fraction] is appended to, for each flower saved that needs a gene test.
+
+    :return: A boolean on whether a new flower was added to the known flower pool.
+
+    commitDiscoveries chooses and saves the flowers; this writes out the text for each, with the parent combo, some probabilities and how to test for said flower.
+    """
+    discoveries = commitDiscoveries(UpdatedFlowerPool, IdentifiedFlowers)
+    for discovery in discoveries:
+        recordDiscovery(discovery, breedingRoute, geneTestRecords)
+    return len(discoveries) > 0
+
+class GeneTestPlanner(object):
+    """Plans gene tests for one unidentified flower, which we know is one of a group of same-coloured candidate gene codes.
+     Inputs: candidates, {candidate flower: prior weight}, e.g. the "Flowers" of an ungened group, whose weights are the counts from the cross it came from;
+     testFlowers, a list of known flowers (same flower name) that can be used as test partners
+
+     Internals:
+     candidateList; the candidate flowers
+     testFlowerList; the test flowers
+     colourMatrix; colourMatrix[test][candidate][colour] = count out of CrossCombinations of getting that colour ('Colours' position) from that test cross.
+     Worked out once up front, so choosing a test is only arithmetic on these numbers.
+     posterior; Fraction chance of each candidate (in candidateList order) given the test children seen so far
+
+     Every test child updates the posterior by Bayes' rule, so a colour shared by several candidates still tells us something,
+     and a colour a candidate cannot give rules it out completely. The flower is identified once one candidate is left.
+     """
+    def __init__(self, candidates, testFlowers):
+        self.candidateList = list(candidates)
+        self.testFlowerList = list(testFlowers)
+        self.colourMatrix = []
+        for testFlower in self.testFlowerList:
+            testRow = []
+            for candidate in self.candidateList:
+                colourCounts = [0] * len(Colours)
+                colourGroups = potentialColours(candidate, testFlower)
+                for colour in colourGroups:
+                    colourCounts[Colours.index(colour)] = colourGroups[colour]["Count"]
+                testRow.append(colourCounts)
+            self.colourMatrix.append(testRow)
+        totalWeight = sum(candidates[candidate] for candidate in self.candidateList)
+        self.posterior = [Fraction(candidates[candidate], totalWeight) for candidate in self.candidateList]
+
+    def colourChances(self, testNumber, posterior = None): #Chance of each colour from one test cross, given a posterior (the current one by default)
+        if posterior is None:
+            posterior = self.posterior
+        chances = [0] * len(Colours)
+        for candidateNumber, chance in enumerate(posterior):
+            if chance:
+                for colourNumber, count in enumerate(self.colourMatrix[testNumber][candidateNumber]):
+                    chances[colourNumber] += chance * Fraction(count, CrossCombinations)
+        return chances
+
+    def afterColour(self, testNumber, colourNumber, posterior = None): #The posterior after a test cross gives a child of one colour
+        if posterior is None:
+            posterior = self.posterior
+        weights = [chance * self.colourMatrix[testNumber][candidateNumber][colourNumber] for candidateNumber, chance in enumerate(posterior)]
+        total = sum(weights)
+        if total == 0:
+            raise ValueError(Colours[colourNumber] + " children are impossible from this test")
+        return [weight / total for weight in weights]
+
+    def informationGain(self, testFlower, posterior = None): #Expected bits of information about the candidate from one cross with testFlower
+        testNumber = self.testFlowerList.index(testFlower)
+        if posterior is None:
+            posterior = self.posterior
+        gain = entropy(posterior)
+        for colourNumber, chance in enumerate(self.colourChances(testNumber, posterior)):
+            if chance:
+                gain -= float(chance) * entropy(self.afterColour(testNumber, colourNumber, posterior))
+        return gain
+
+    def bestTest(self): #The test flower with the largest expected information gain right now, as [test flower, gain in bits], or None if no test tells the candidates apart
+        best = None
+        for testFlower in self.testFlowerList:
+            gain = self.informationGain(testFlower)
+            if gain > 1e-12 and (best is None or gain > best[1]):
+                best = [testFlower, gain]
+        return best
+
+    def update(self, testFlower, colour): #Records that a cross with testFlower gave a child of this colour. Raises ValueError if no remaining candidate could give it.
+        self.posterior = self.afterColour(self.testFlowerList.index(testFlower), Colours.index(colour))
+
+    def remaining(self): #{candidate: chance} for the candidates that have not been ruled out
+        return {candidate: chance for candidate, chance in zip(self.candidateList, self.posterior) if chance}
+
+    def identified(self): #The candidate, once it is the only one left, otherwise None
+        remaining = self.remaining()
+        return next(iter(remaining)) if len(remaining) == 1 else None
+
+    def expectedTests(self): #Expected test crosses to be certain which candidate this is, always using the best test; float("inf") if the candidates can never all be told apart
+        """
+        Certainty only comes from ruling candidates out, so this works over the set of candidates still possible.
+        For each set, the test with the largest information gain among those that can rule something out is used, and crosses that rule nothing out are repeated:
+        E(set) = (1 + sum over colours that shrink the set of chance * E(smaller set)) / (1 - chance of a colour that shrinks nothing).
+        Within a set the candidates keep their current relative chances; the shift from repeated shared colours is ignored.
+        """
+        expected = {}
+        def expectedFrom(support):
+            if len(support) < 2:
+                return 0.0
+            if support in expected:
+                return expected[support]
+            posterior = [self.posterior[candidateNumber] if candidateNumber in support else 0 for candidateNumber in range(len(self.candidateList))]
+            total = sum(posterior)
+            posterior = [chance / total for chance in posterior]
+            best = None
+            for testNumber, testFlower in enumerate(self.testFlowerList):
+                outcomes = []
+                for colourNumber, chance in enumerate(self.colourChances(testNumber, posterior)):
+                    if chance:
+                        outcomes.append([chance, frozenset(candidateNumber for candidateNumber in support if self.colourMatrix[testNumber][candidateNumber][colourNumber])])
+                if all(smaller == support for chance, smaller in outcomes):
+                    continue
+                gain = self.informationGain(testFlower, posterior)
+                if best is None or gain > best[0]:
+                    best = [gain, outcomes]
+            if best is None:
+                expected[support] = float("inf")
+            else:
+                stayChance = sum(chance for chance, smaller in best[1] if smaller == support)
+                expected[support] = (1 + sum(float(chance) * expectedFrom(smaller) for chance, smaller in best[1] if smaller != support)) / float(1 - stayChance)
+            return expected[support]
+        return expectedFrom(frozenset(candidateNumber for candidateNumber, chance in enumerate(self.posterior) if chance))
+
+def entropy(chances): #Shannon entropy in bits of a list of chances
+    return -sum(float(chance) * math.log2(chance) for chance in chances if chance)
+
+class CountingFlowerIndex(KnownFlowerIndex):
+    """A KnownFlowerIndex that also counts how many times it is asked whether it holds a flower (i.e. IsFlowerNotDiscovered checks).
+     Only used when a solve is profiled, so an unprofiled solve pays nothing for the count.
+     """
+    def __init__(self, flowers = ()):
+        self.checks = 0
+        KnownFlowerIndex.__init__(self, flowers)
+
+    def __contains__(self, flower):
+        self.checks += 1
+        return flower.flowerId in self.positions
+
+class SolverProfile(object):
+    """Timings, counters and pool sizes for every generation of a solve. Pass one to solveSpecies() or solve() to turn profiling on; without one nothing is timed or counted.
+     Inputs: onGeneration, optional function called with each generation record as it is added
+
+     Internals:
+     generations; a record per generation, in the order they were added. Each is a dictionary:
+     {"Flower": flower name, "Generation": generation number (from 0),
+      "Seconds": {"Breed": BreedNewFlowers, "Save": both commitDiscoveries calls, "Identify": IdentifyUngenedFlowers (0 when breeding found something)},
+      "Counts": {"Pairs Crossed": pairs bred this generation, "Crosses Worked Out": new pairOutcomes entries, from breeding and gene tests,
+                 "Gene Tests": geneTestResult calls, "Gene Tests Worked Out": of those, not already remembered,
+                 "Discovery Checks": IsFlowerNotDiscovered checks against the known pool, "Candidates": flowers in IdentifiedFlowers, "New Flowers": flowers saved},
+      "Known Flowers": known pool size at the end of the generation, "Ungened Groups": ungened groups at the end of the generation}
+     Every value is a plain number or string, so records can be sent between processes and written out as JSON.
+     """
+    def __init__(self, onGeneration = None):
+        self.generations = []
+        self.onGeneration = onGeneration
+
+    def record(self, generationRecord): #Adds one generation record, e.g. one made in a worker process, and passes it on to onGeneration
+        self.generations.append(generationRecord)
+        if self.onGeneration is not None:
+            self.onGeneration(generationRecord)
+
+    def startGeneration(self, flowerName, generation, UpdatedFlowerPool, crossedFlowers): #Starts a generation record; the phase timings and counts are filled in by phaseDone and endGeneration
+        geneTestInfo = geneTestResult.cache_info()
+        return {"Flower": flowerName, "Generation": generation,
+                "Seconds": {"Breed": 0.0, "Save": 0.0, "Identify": 0.0},
+                "Counts": {"Pairs Crossed": -sum(count * (count + 1) // 2 for count in crossedFlowers.values()),
+                           "Crosses Worked Out": -len(pairOutcomes),
+                           "Gene Tests": -(geneTestInfo.hits + geneTestInfo.misses),
+                           "Gene Tests Worked Out": -geneTestInfo.misses,
+                           "Discovery Checks": -getattr(UpdatedFlowerPool, "checks", 0), #Only counted by a CountingFlowerIndex
+                           "Candidates": 0,
+                           "New Flowers": -len(UpdatedFlowerPool)},
+                "Started": time.perf_counter()}
+
+    def phaseDone(self, generationRecord, phase): #Adds the time since the last phase (or the start of the generation) to one phase of a generation record
+        now = time.perf_counter()
+        generationRecord["Seconds"][phase] += now - generationRecord["Started"]
+        generationRecord["Started"] = now
+
+    def endGeneration(self, generationRecord, UpdatedFlowerPool, crossedFlowers, UngenedflowerPool, IdentifiedFlowers): #Finishes the counts of a generation record and records it
+        geneTestInfo = geneTestResult.cache_info()
+        counts = generationRecord["Counts"]
+        counts["Pairs Crossed"] += sum(count * (count + 1) // 2 for count in crossedFlowers.values())
+        counts["Crosses Worked Out"] += len(pairOutcomes)
+        counts["Gene Tests"] += geneTestInfo.hits + geneTestInfo.misses
+        counts["Gene Tests Worked Out"] += geneTestInfo.misses
+        counts["Discovery Checks"] += getattr(UpdatedFlowerPool, "checks", 0)
+        counts["Candidates"] = sum(len(IdentifiedFlowers[flowerName][Gene]) for flowerName in IdentifiedFlowers for Gene in IdentifiedFlowers[flowerName])
+        counts["New Flowers"] += len(UpdatedFlowerPool)
+        del generationRecord["Started"]
+        generationRecord["Known Flowers"] = len(UpdatedFlowerPool)
+        generationRecord["Ungened Groups"] = len(UngenedflowerPool)
+        self.record(generationRecord)
+
+    def summary(self): #{flower name: {"Generations": n, "Seconds": {phase: total}, "Counts": {counter: total}, "Peak Known Flowers": n, "Peak Ungened Groups": n}}, flower names in the order they were first recorded
+        totals = {}
+        for generationRecord in self.generations:
+            total = totals.setdefault(generationRecord["Flower"], {"Generations": 0, "Seconds": {}, "Counts": {}, "Peak Known Flowers": 0, "Peak Ungened Groups": 0})
+            total["Generations"] += 1
+            for phase, seconds in generationRecord["Seconds"].items():
+                total["Seconds"][phase] = total["Seconds"].get(phase, 0.0) + seconds
+            for counter, count in generationRecord["Counts"].items():
+                total["Counts"][counter] = total["Counts"].get(counter, 0) + count
+            total["Peak Known Flowers"] = max(total["Peak Known Flowers"], generationRecord["Known Flowers"])
+            total["Peak Ungened Groups"] = max(total["Peak Ungened Groups"], generationRecord["Ungened Groups"])
+        return totals
+
+    def toJSON(self): #The generation records and the summary as a JSON string
+        return json.dumps({"Generations": self.generations, "Summary": self.summary()}, indent=2)
+
+def iterSpeciesDiscoveries(flowerName, UpdatedFlowerPool, profile = None): #Runs the breed / identify / save loop for one flower name, yielding a Discovery for each flower found
+    """
+    :param flowerName: The flower name to solve, from 'flowerList'
+    :param UpdatedFlowerPool: A KnownFlowerIndex of the flowers of that name we start with. Each flower found is added to it before it is yielded.
+    :param profile: Optional SolverProfile to record each generation's phase timings, counts and pool sizes in
+    :return: A generator of Discovery, in the order the flowers were found. The loop only runs as far as the generator is read, so stopping early stops the solve.
+
+    Flowers of different names never breed, so each flower name is searched on its own, with its own known pool, ungened groups and generation count.
+    Each generation, the flowers found in the last generation are bred with every known flower and any identifiable children saved;
+    gene tests are only tried in a generation where breeding found nothing new. A generation's discoveries are yielded as soon as it has finished.
+    """
+    UngenedflowerPool = {}
+    crossedFlowers = {}
+    discoveries = [None]
+    generation = 0
+    while (discoveries):
+        IdentifiedFlowers = {}
+        for flower in flowerList:
+            IdentifiedFlowers[flower] = {} #Initialises a dictionary of all the flower names so we can search through them properly
+
+        if profile is not None:
+            generationRecord = profile.startGeneration(flowerName, generation, UpdatedFlowerPool, crossedFlowers)
+        BreedNewFlowers(UpdatedFlowerPool, IdentifiedFlowers, UngenedflowerPool, crossedFlowers)
+        if profile is not None:
+            profile.phaseDone(generationRecord, "Breed")
+        discoveries = commitDiscoveries(UpdatedFlowerPool, IdentifiedFlowers, generation)
+        if profile is not None:
+            profile.phaseDone(generationRecord, "Save")
+        if not discoveries:
+            IdentifyUngenedFlowers(UngenedflowerPool, IdentifiedFlowers, UpdatedFlowerPool)
+            if profile is not None:
+                profile.phaseDone(generationRecord, "Identify")
+            discoveries = commitDiscoveries(UpdatedFlowerPool, IdentifiedFlowers, generation)
+            if profile is not None:
+                profile.phaseDone(generationRecord, "Save")
+        if profile is not None:
+            profile.endGeneration(generationRecord, UpdatedFlowerPool, crossedFlowers, UngenedflowerPool, IdentifiedFlowers)
+        generation += 1
+        for discovery in discoveries:
+            yield discovery
+
+def iter_discoveries(species_list = None, seedFlowers = None, profile = None): #Solves flower names one after another in this process, yielding a Discovery for each flower as soon as it is found
+    """
+    :param species_list: The flower names to solve, from 'flowerList'. Defaults to all of them.
+    :param seedFlowers: The flowers we start with. Defaults to initialflowerPool.
+    :param profile: Optional SolverProfile, as for solve()
+    :return: A generator of Discovery, flower names in species_list order. E.g. to stop at a black rose:
+    for discovery in iter_discoveries(["Rose"]):
+        if discovery.flower.colour == "Black": break
+
+    Unlike solve(), nothing is buffered or farmed out to worker processes, and the seed flowers themselves are not yielded.
+    """
+    if species_list is None:
+        species_list = flowerList
+    if seedFlowers is None:
+        seedFlowers = initialflowerPool
+    for flowerName in species_list:
+        speciesSeeds = [flower for flower in seedFlowers if flower.flowerName == flowerName]
+        yield from iterSpeciesDiscoveries(flowerName, KnownFlowerIndex(speciesSeeds) if profile is None else CountingFlowerIndex(speciesSeeds), profile)
+
+def solveSpecies(flowerName, seedFlowers, breedingRoute = None, geneTestRecords = None, profile = None): #Runs the breed / identify / save loop for one flower name until it stops finding new flowers
+    """
+    :param flowerName: The flower name to solve, from 'flowerList'
+    :param seedFlowers: The flowers of that name we start with, e.g. the seed flowers from initialflowerPool
+    :param breedingRoute: Optional list to collect the text for each saved flower (see SaveFlowers). If it is not given, progress is printed instead.
+    :param geneTestRecords: Optional list to collect the gene tests of saved flowers (see SaveFlowers)
+    :param profile: Optional SolverProfile to record each generation's phase timings, counts and pool sizes in
+    :return: A KnownFlowerIndex of every flower of this name that could be bred and identified, in the order they were found
+
+    The loop itself is iterSpeciesDiscoveries; this collects what it finds.
+    """
+    UpdatedFlowerPool = KnownFlowerIndex(seedFlowers) if profile is None else CountingFlowerIndex(seedFlowers)
+    generation = None
+    for discovery in iterSpeciesDiscoveries(flowerName, UpdatedFlowerPool, profile):
+        if breedingRoute is None and discovery.generation != generation:
+            generation = discovery.generation
+            print(flowerName + " generation " + str(generation)) #The generation is more a curiousity/debugging tool.
+        recordDiscovery(discovery, breedingRoute, geneTestRecords)
+    return UpdatedFlowerPool
+
+def solveSpeciesJob(job): #Runs solveSpecies in a worker process. Takes [flowerName, seedFlowers, profiled?] and gives back [flowerName, found flowers, breeding route, gene test records, generation records (None if not profiled)]
+    breedingRoute = []
+    geneTestRecords = []
+    profile = SolverProfile() if job[2] else None
+    foundFlowers = list(solveSpecies(job[0], job[1], breedingRoute, geneTestRecords, profile))
+    return [job[0], foundFlowers, breedingRoute, geneTestRecords, None if profile is None else profile.generations]
+
+def runSpeciesJobs(function, jobs, workers): #Gives function(job) for each job, one worker process per job, in whatever order they finish. workers = 1 (or a single job) runs them in this process, in order.
+    if workers == 1 or len(jobs) < 2:
+        yield from map(function, jobs)
+        return
+    import multiprocessing #only needed here, and slow enough to import that library users shouldn't pay for it up front
+    processPool = multiprocessing.Pool(min(workers, len(jobs)))
+    try:
+        yield from processPool.imap_unordered(function, jobs)
+    finally:
+        processPool.close()
+        processPool.join()
+
+def solve(species_list, workers = None, seedFlowers = None, onSpeciesSolved = None, profile = None): #Solves several flower names at once, one worker process per flower name
+    """
+    :param species_list: The flower names to solve, from 'flowerList'
+    :param workers: Number of worker processes. Defaults to one per CPU; 1 solves everything in this process.
+    :param seedFlowers: The flowers we start with. Defaults to initialflowerPool.
+    :param onSpeciesSolved: Optional function called as onSpeciesSolved(flowerName, found flowers, breeding route) as soon as each flower name is solved.
+    Flower names finish in whatever order the workers get through them.
+    :param profile: Optional SolverProfile. Each worker profiles its own flower name, and its generation records are added to profile (and passed to its onGeneration) when that name is solved.
+    :return: [UpdatedFlowerPool, breedingRoutes, geneTests]
+    UpdatedFlowerPool; a KnownFlowerIndex of every flower found, grouped by flower name in species_list order
+    breedingRoutes; {flower name: [text for each flower saved, in the order it was found]}, also in species_list order
+    geneTests; {flower name: [[saved flower, test flower, [successful test colours], probability of a successful test as a Fraction] for each flower that needs a gene test]}
+
+    Flowers of different names never breed together, so each flower name is an independent solveSpecies run.
+    The names with 4 genes (Rose) are handed out first, as they take by far the longest; the merged output does not depend on which worker finished first.
+    """
+    if seedFlowers is None:
+        seedFlowers = initialflowerPool
+    if workers is None:
+        workers = os.cpu_count() or 1
+    jobs = [[flowerName, [flower for flower in seedFlowers if flower.flowerName == flowerName], profile is not None] for flowerName in species_list]
+    jobs.sort(key=lambda job: len(flowerGeneCodes(job[0])), reverse=True)
+    results = {}
+    for flowerName, foundFlowers, breedingRoute, geneTestRecords, generationRecords in runSpeciesJobs(solveSpeciesJob, jobs, workers):
+        results[flowerName] = [foundFlowers, breedingRoute, geneTestRecords]
+        if profile is not None:
+            for generationRecord in generationRecords:
+                profile.record(generationRecord)
+        if onSpeciesSolved is not None:
+            onSpeciesSolved(flowerName, foundFlowers, breedingRoute)
+    UpdatedFlowerPool = KnownFlowerIndex()
+    breedingRoutes = {}
+    geneTests = {}
+    for flowerName in species_list:
+        for flower in results[flowerName][0]:
+            UpdatedFlowerPool.append(flower)
+        breedingRoutes[flowerName] = results[flowerName][1]
+        geneTests[flowerName] = results[flowerName][2]
+    return [UpdatedFlowerPool, breedingRoutes, geneTests]
+
+def speciesSolution(flowerName, seedIds): #solveSpecies for one flower name from a tuple of seed flowerIds, in the order they were given. Remembers the most recent SpeciesSolutionCacheSize (flower name, seeds) solutions.
+    """
+    :return: (found flowerIds, breeding route texts, gene test records as (flowerId, test flowerId, colours, probability)), all tuples, as this is shared between callers
+
+    A solution is only reused for exactly the same seeds. Carrying on from the solution of a subset of the seeds would find the same flowers,
+    but keep that subset's routes, which can be worse than the routes the extra seeds allow, and would list the extra seeds as bred.
+    """
+    solutionKey = (flowerName, seedIds)
+    if solutionKey in speciesSolutions:
+        speciesSolutions.move_to_end(solutionKey)
+        return speciesSolutions[solutionKey]
+    breedingRoute = []
+    geneTestRecords = []
+    foundFlowers = solveSpecies(flowerName, [Flower.fromId(flowerId) for flowerId in seedIds], breedingRoute, geneTestRecords)
+    solution = (tuple(flower.flowerId for flower in foundFlowers), tuple(breedingRoute),
+                tuple((flower.flowerId, testFlower.flowerId, tuple(colours), probability) for flower, testFlower, colours, probability in geneTestRecords))
+    speciesSolutions[solutionKey] = solution
+    if len(speciesSolutions) > SpeciesSolutionCacheSize:
+        speciesSolutions.popitem(last=False)
+    return solution
+
+def solve_scenario(seedFlowers, species_list = None): #solve() for any starting flowers, e.g. a player's own flowers or island imports, reusing everything already worked out in this process
+    """
+    :param seedFlowers: The flowers we start with, of any names. Repeats are ignored.
+    :param species_list: The flower names to solve, from 'flowerList'. Defaults to all of them.
+    :return: The same [UpdatedFlowerPool, breedingRoutes, geneTests] as solve()
+
+    Each flower name is solved from its own seeds only. Solutions are only reused for exactly the same seeds of a flower name (speciesSolution),
+    so repeating a seed set is a lookup, but any other seed set, even the default seeds plus one import, is a full solve of that flower name.
+    That solve starts from the cross table, pair colour tables, pairOutcomes, gene test results and distinguishingGenes left warm by earlier scenarios,
+    which makes it several times quicker than a cold one, but nowhere near a lookup.
+    Seeds are taken in the order they are given, as solve() takes them; the order can change which of two equally good routes is listed.
+    Everything runs in this process, as the warm state is what makes a scenario cheap.
+    """
+    if species_list is None:
+        species_list = flowerList
+    UpdatedFlowerPool = KnownFlowerIndex()
+    breedingRoutes = {}
+    geneTests = {}
+    for flowerName in species_list:
+        seedIds = tuple(dict.fromkeys(flower.flowerId for flower in seedFlowers if flower.flowerName == flowerName))
+        flowerIds, breedingRoute, geneTestIds = speciesSolution(flowerName, seedIds)
+        for flowerId in flowerIds:
+            UpdatedFlowerPool.append(Flower.fromId(flowerId))
+        breedingRoutes[flowerName] = list(breedingRoute)
+        geneTests[flowerName] = [[Flower.fromId(flowerId), Flower.fromId(testId), list(colours), probability] for flowerId, testId, colours, probability in geneTestIds]
+    return [UpdatedFlowerPool, breedingRoutes, geneTests]
+
+def solutionCacheKey(species_list, seedFlowers): #sha256 of everything a solve() result depends on: the colour table, the seed flowers, the flower names asked for and SolverVersion
+    #The seeds go in in the order given, as solve() breeds them in that order and the order can change which of two equally good routes it lists
+    keyData = hashlib.sha256()
+    keyData.update(getColourTable())
+    keyData.update(repr([SolverVersion, list(species_list), [flower.flowerId for flower in seedFlowers]]).encode("utf-8"))
+    return keyData.hexdigest()
+
+def solveCached(species_list, workers = None, seedFlowers = None, cacheDirectory = None): #solve(), but loading the answer from disk when the same problem has been solved before
+    """
+    :param species_list, workers, seedFlowers: As for solve()
+    :param cacheDirectory: Where solutions are kept. Defaults to SolutionCacheDirectory; None there too turns the cache off.
+    :return: The same [UpdatedFlowerPool, breedingRoutes, geneTests] as solve()
+
+    Each solution is one pickle file of plain flowerIds, strings and numbers, named by solutionCacheKey.
+    Changing the colour table, the seed flowers (or their order) or SolverVersion changes the key, so a stale solution is never read and the next call solves and saves again.
+    Any cache file that cannot be read back into a solution is treated as missing, and failing to save is not an error.
+    """
+    if seedFlowers is None:
+        seedFlowers = initialflowerPool
+    if cacheDirectory is None:
+        cacheDirectory = SolutionCacheDirectory
+    if cacheDirectory is None:
+        return solve(species_list, workers, seedFlowers)
+    cachePath = os.path.join(cacheDirectory, solutionCacheKey(species_list, seedFlowers) + ".solution")
+    try:
+        with open(cachePath, "rb") as cacheFile:
+            flowerIds, breedingRoutes, geneTestIds = pickle.load(cacheFile)
+        UpdatedFlowerPool = KnownFlowerIndex(Flower.fromId(flowerId) for flowerId in flowerIds)
+        geneTests = {}
+        for flowerName in geneTestIds:
+            geneTests[flowerName] = [[Flower.fromId(flowerId), Flower.fromId(testId), colours, probability] for flowerId, testId, colours, probability in geneTestIds[flowerName]]
+        return [UpdatedFlowerPool, breedingRoutes, geneTests]
+    except Exception: #Missing, truncated, or a stale or foreign pickle (which can fail in almost any way); solve it again
+        pass
+    UpdatedFlowerPool, breedingRoutes, geneTests = solve(species_list, workers, seedFlowers)
+    geneTestIds = {}
+    for flowerName in geneTests:
+        geneTestIds[flowerName] = [[flower.flowerId, testFlower.flowerId, colours, probability] for flower, testFlower, colours, probability in geneTests[flowerName]]
+    try:
+        os.makedirs(cacheDirectory, exist_ok=True)
+        temporaryPath = cachePath + "." + str(os.getpid())
+        with open(temporaryPath, "wb") as cacheFile:
+            pickle.dump([[flower.flowerId for flower in UpdatedFlowerPool], breedingRoutes, geneTestIds], cacheFile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaryPath, cachePath)
+    except OSError:
+        pass
+    return [UpdatedFlowerPool, breedingRoutes, geneTests]
+
+RouteStep = namedtuple("RouteStep", ["flower", "parents", "probability", "ID", "testFlower", "testProbability", "expectedAttempts"])
+RouteStep.__doc__ = """One flower of a planned breeding route.
+ flower; the flower this step breeds
+ parents; [ParentA, ParentB] to breed it from
+ probability; chance of each cross giving this flower, as a Fraction
+ ID; how it is identified, from IdentificationReasons
+ testFlower; the known flower to gene test it with, or None if no gene test is needed
+ testProbability; chance of a gene test cross showing one of its identifying colours, as a Fraction (None without a gene test)
+ expectedAttempts; expected crosses for this step alone, gene test crosses included, as a Fraction
+ """
+
+@functools.lru_cache(maxsize=64)
+def routeTable(flowerName, seedIds): #Cheapest way to reach every gene code of one flower name from some seed flowers, worked out once per (flower name, seeds)
+    """
+    :param flowerName: A flower name from 'flowerList'
+    :param seedIds: A sorted tuple of the seed flowers' flowerIds
+    :return: [cost, steps]
+    cost; {GeneList position: expected number of crosses to get this flower from the seeds, as a Fraction}, for every reachable gene code
+    steps; {GeneList position: RouteStep of the last cross of its cheapest route}, None for seed flowers
+
+    This is Dijkstra's algorithm on the gene code graph, extended to pairs (Knuth's generalisation).
+    Flowers are not used up by breeding, so a route pays once for every flower it passes through: its cost is the sum of expectedAttempts over its steps.
+    A child's cost is that sum over the routes of both parents (and of its test flower, if it needs one), each flower counted once, plus its own step:
+    the expected crosses to breed it (1 / probability), plus, for a child that shares its colour, the crosses to find it among its same-coloured siblings
+    with the test flower: (colour probability / child probability) / test probability. A self-cross pays for its parent once.
+    Each flower keeps the single route that is cheapest for it alone, and pairs are costed on those routes. A dearer route for one parent that shares more
+    flowers with the other parent's route is never looked at, so a cost is the cheapest for these routes, not always the cheapest over every possible route.
+    Flowers are settled in order of cost, and every (parent, parent, test flower) combination is costed when the last of the three is settled:
+    a pair is costed against the test flowers settled so far when its later parent is settled, and its gene tested children are kept in 'pending'
+    so each test flower settled afterwards is tried on them too. A gene tested child costs at least its pair and its test flower, whichever is dearer, plus its breeding crosses,
+    so a pending child is dropped once it is settled or the flower being settled makes that no cheaper than its best route, as every later test flower costs at least as much.
+    Test chances come from the pair colour tables and masks, so nothing is bred. All costs are exact Fractions, so equal-cost routes tie exactly.
+    """
+    flowerNumber = flowerNumbers[flowerName]
+    flowerBase = flowerNumber * GeneCodeCount
+    offsets, childGenes, childCounts = getCrossTable()
+    colourTable = getPairColourTable(flowerNumber)
+    colourMasks = getPairColourMasks(flowerNumber)
+    colourCount = len(Colours)
+    childColours = getColourTable()[flowerBase:flowerBase + GeneCodeCount]
+    cost = {}
+    steps = {}
+    lineage = {} #GeneList position : gene code bit mask of every flower its route breeds, itself included (0 for seed flowers)
+    bestCost = {}
+    bestStep = {}
+    bestLineage = {}
+    lineageCosts = {0: Fraction(0)} #gene code bit mask : sum of its flowers' expectedAttempts
+    settled = []
+    pending = [] #[cost before the test, child, probability, same-coloured crosses to search, same-coloured siblings, parents, lineage of the pair] of gene tested children
+    queue = []
+
+    def lineageCost(geneMask): #The expected crosses of breeding every flower in a lineage mask once
+        if geneMask not in lineageCosts:
+            lineageCosts[geneMask] = sum(steps[gene].expectedAttempts for gene in range(GeneCodeCount) if geneMask >> gene & 1)
+        return lineageCosts[geneMask]
+
+    def offer(child, childCost, step, childLineage): #Keeps a route to child if it is the cheapest so far
+        if childCost < bestCost.get(child, float("inf")):
+            bestCost[child] = childCost
+            bestStep[child] = step
+            bestLineage[child] = childLineage | 1 << child
+            heapq.heappush(queue, (childCost, child))
+
+    def tryTest(entry, testGene): #Costs a gene tested child with one test flower, keeping it if it is the cheapest route so far
+        childCost, child, probability, searchCrosses, siblings, parents, pairLineage = entry
+        siblingMask = 0
+        for sibling in siblings:
+            siblingMask |= colourMasks[sibling * GeneCodeCount + testGene]
+        uniqueMask = colourMasks[child * GeneCodeCount + testGene] & ~siblingMask
+        if not uniqueMask:
+            return
+        pairStart = (child * GeneCodeCount + testGene) * colourCount
+        testCount = sum(colourTable[pairStart + colourNumber] for colourNumber in range(colourCount) if uniqueMask >> colourNumber & 1)
+        testProbability = Fraction(testCount, CrossCombinations)
+        stepAttempts = 1/probability + searchCrosses/testProbability
+        testLineage = pairLineage | lineage[testGene]
+        offer(child, lineageCost(testLineage) + stepAttempts,
+              RouteStep(Flower.fromId(flowerBase + child), parents, probability, IdentificationReasons[2], Flower.fromId(flowerBase + testGene), testProbability, stepAttempts), testLineage)
+
+    for flowerId in seedIds:
+        bestCost[flowerId - flowerBase] = Fraction(0)
+        bestStep[flowerId - flowerBase] = None
+        bestLineage[flowerId - flowerBase] = 0
+        heapq.heappush(queue, (Fraction(0), flowerId - flowerBase))
+    while queue:
+        geneCost, gene = heapq.heappop(queue)
+        if gene in cost:
+            continue
+        cost[gene] = geneCost
+        steps[gene] = bestStep[gene]
+        lineage[gene] = bestLineage[gene]
+        settled.append(gene)
+        stillPending = []
+        for entry in pending: #The new flower as a test flower for children of earlier pairs
+            if entry[1] in cost or max(entry[0], geneCost + 1/entry[2]) >= bestCost.get(entry[1], float("inf")):
+                continue
+            tryTest(entry, gene)
+            stillPending.append(entry)
+        for partner in settled: #The new flower as a parent
+            pairIndex = gene * GeneCodeCount + partner
+            pairLineage = lineage[gene] | lineage[partner]
+            pairCost = lineageCost(pairLineage)
+            children = [[childGenes[entry], childCounts[entry]] for entry in range(offsets[pairIndex], offsets[pairIndex + 1])]
+            colourGroups = {}
+            for child, count in children:
+                colourGroups.setdefault(childColours[child], []).append([child, count])
+            parents = [Flower.fromId(flowerBase + gene), Flower.fromId(flowerBase + partner)]
+            for child, count in children:
+                if child in cost:
+                    continue
+                probability = Fraction(count, CrossCombinations)
+                childCost = pairCost + 1/probability
+                if childCost >= bestCost.get(child, float("inf")):
+                    continue
+                group = colourGroups[childColours[child]]
+                if len(children) < 2 or len(group) < 2:
+                    offer(child, childCost, RouteStep(Flower.fromId(flowerBase + child), parents, probability, IdentificationReasons[0 if len(children) < 2 else 1], None, None, 1/probability), pairLineage)
+                    continue
+                entry = [childCost, child, probability, Fraction(sum(siblingCount for sibling, siblingCount in group), count),
+                         [sibling for sibling, siblingCount in group if sibling != child], parents, pairLineage]
+                for testGene in settled: #settled is in order of cost, so once a test flower alone costs too much, so do the rest
+                    if cost[testGene] + 1/probability >= bestCost.get(child, float("inf")):
+                        break
+                    tryTest(entry, testGene)
+                stillPending.append(entry)
+        pending = stillPending
+    return [cost, steps]
+
+def plan_route(species, target_genotype, seedFlowers = None): #Finds the breeding route to a flower with the fewest expected crosses, e.g. plan_route("Rose", "RRyyWWBB")
+    """
+    :param species: A flower name from 'flowerList'
+    :param target_genotype: The gene code to reach, as a GeneList string (e.g. "rryyWWbb") or a GeneList position
+    :param seedFlowers: The flowers we start with. Defaults to initialflowerPool.
+    :return: [expected crosses in total as a Fraction, [RouteStep for each flower to breed, parents before children]], or None if the flower cannot be reached.
+    Each flower is listed once, however many later steps use it, and the total is the sum of the steps' expectedAttempts. A seed flower is reached with 0 crosses and no steps.
+
+    The costs for every gene code of a flower name are worked out once by routeTable and reused, so later queries are a lookup and a walk back up the route.
+    """
+    if seedFlowers is None:
+        seedFlowers = initialflowerPool
+    if isinstance(target_genotype, str):
+        target_genotype = GeneList.index(target_genotype)
+    seedIds = tuple(sorted(flower.flowerId for flower in seedFlowers if flower.flowerName == species))
+    cost, steps = routeTable(species, seedIds)
+    if target_genotype not in cost:
+        return None
+    route = []
+    routed = set()
+    def addSteps(gene): #Adds the steps for a flower after the steps for its parents and test flower
+        if gene in routed or steps[gene] is None:
+            return
+        routed.add(gene)
+        step = steps[gene]
+        for flower in step.parents + ([step.testFlower] if step.testFlower is not None else []):
+            addSteps(flower.GeneIndex)
+        route.append(step)
+    addSteps(target_genotype)
+    return [cost[target_genotype], route]
+
+ReportColumns = ["Flower", "Gene Code", "Colour", "Seed", "Found", "Generation", "Last Cross Probability", "ID", "Test Flower", "Test Probability", "Expected Crosses"]
+#The columns of reachabilityReport. Found and Generation come from the solver's loop; Last Cross Probability to Test Probability from the last cross of the cheapest route
+#(routeTable), and Expected Crosses from that whole route.
+
+def reportSpeciesJob(job): #The reachabilityReport rows for one flower name. Takes [flowerName, seedFlowers] and gives back [flowerName, rows], each row a list in ReportColumns order
+    flowerName, seedFlowers = job
+    seedIds = tuple(sorted(flower.flowerId for flower in seedFlowers))
+    discoveries = {discovery.flower.flowerId: discovery for discovery in iterSpeciesDiscoveries(flowerName, KnownFlowerIndex(seedFlowers))}
+    cost, steps = routeTable(flowerName, seedIds)
+    flowerBase = flowerNumbers[flowerName] * GeneCodeCount
+    rows = []
+    for gene in flowerGeneCodes(flowerName):
+        flower = Flower.fromId(flowerBase + gene)
+        seed = flower.flowerId in seedIds
+        discovery = discoveries.get(flower.flowerId)
+        step = steps.get(gene)
+        row = [flowerName, flower.GeneCode, flower.colour, seed, seed or discovery is not None, 0 if seed else (None if discovery is None else discovery.generation + 1)]
+        if step is None:
+            row += [None, "Seed" if seed else None, None, None]
+        else:
+            row += [float(step.probability), step.ID, None if step.testFlower is None else step.testFlower.GeneCode, None if step.testProbability is None else float(step.testProbability)]
+        row.append(float(cost[gene]) if gene in cost else None)
+        rows.append(row)
+    return [flowerName, rows]
+
+def reachabilityReport(species_list = None, workers = None, seedFlowers = None): #Whether, when and how every gene code of every flower name can be reached from the seed flowers
+    """
+    :param species_list: The flower names to report on, from 'flowerList'. Defaults to all of them.
+    :param workers: Number of worker processes, as for solve()
+    :param seedFlowers: The flowers we start with. Defaults to initialflowerPool.
+    :return: {column: [value for each gene code]}, columns in ReportColumns order, rows by flower name (species_list order) then GeneList position.
+    Flower, Gene Code, Colour; the flower
+    Seed; whether it is a seed flower
+    Found; whether the solver breeds and identifies it
+    Generation; solver generations to find it (0 for a seed flower), None if not found
+    Last Cross Probability; chance of the last cross of its cheapest route giving it. The whole route's figure is Expected Crosses.
+    ID; how that cross's child is identified, from IdentificationReasons ("Seed" for a seed flower)
+    Test Flower, Test Probability; the gene code of the gene test partner, and the chance of the test showing an identifying colour, when a gene test is needed
+    Expected Crosses; expected crosses of the cheapest route from the seeds, each flower on it bred once (the sum of plan_route's expectedAttempts)
+    Route columns are None for gene codes no route reaches. Probabilities and crosses are floats, so the columns can go straight to csv or JSON.
+    """
+    if species_list is None:
+        species_list = flowerList
+    if seedFlowers is None:
+        seedFlowers = initialflowerPool
+    if workers is None:
+        workers = os.cpu_count() or 1
+    jobs = [[flowerName, [flower for flower in seedFlowers if flower.flowerName == flowerName]] for flowerName in species_list]
+    jobs.sort(key=lambda job: len(flowerGeneCodes(job[0])), reverse=True)
+    results = dict(runSpeciesJobs(reportSpeciesJob, jobs, workers))
+    report = {column: [] for column in ReportColumns}
+    for flowerName in species_list:
+        for row in results[flowerName]:
+            for column, value in zip(ReportColumns, row):
+                report[column].append(value)
+    return report
+
+def writeReport(report, path): #Writes a reachabilityReport to path: as columnar JSON ({column: [values]}) if it ends with .json, otherwise as csv with a header row and empty cells for None
+    if path.endswith(".json"):
+        with open(path, "w") as reportFile:
+            json.dump(report, reportFile)
+        return
+    with open(path, "w", newline="") as reportFile:
+        writer = csv.writer(reportFile)
+        writer.writerow(ReportColumns)
+        for row in zip(*[report[column] for column in ReportColumns]):
+            writer.writerow(["" if value is None else value for value in row])
+
+def compileColourTable(csvText): #Turns the text of a Flower,GeneCode,Colour csv file into the compiled colour table
+    """
+    :param csvText: Contents of a csv file with a Flower,GeneCode,Colour header, and a row for each gene code each flower in 'flowerList' can have
+    :return: bytes of length len(flowerList) * 81, where entry flowerId is the position of that flower's colour in 'Colours', or NoColour
+    """
+    table = bytearray([NoColour]) * (len(flowerList) * GeneCodeCount)
+    for row in csv.DictReader(csvText.splitlines()):
+        if row["Flower"] not in flowerNumbers or row["GeneCode"] not in GeneList or row["Colour"] not in Colours:
+            raise ValueError("Unknown flower, gene code or colour in colour table row: " + ",".join([row["Flower"], row["GeneCode"], row["Colour"]]))
+        table[flowerNumbers[row["Flower"]] * GeneCodeCount + GeneList.index(row["GeneCode"])] = Colours.index(row["Colour"])
+    return bytes(table)
+
+def loadColourTable(path = None): #Loads the compiled colour table for a colour csv file, compiling it only if there is no up to date compiled copy next to it
+    """
+    :param path: A Flower,GeneCode,Colour csv file. Defaults to ColourTablePath.
+    :return: The compiled colour table (see compileColourTable)
+
+    The compiled table is saved as path + ".compiled": a sha256 of the csv it came from, a newline, then the table.
+    If the csv changes the hash no longer matches and the table is compiled again. Failing to save the compiled copy is not an error.
+    """
+    if path is None:
+        path = ColourTablePath
+    with open(path, "rb") as csvFile:
+        csvBytes = csvFile.read()
+    csvHash = hashlib.sha256(csvBytes).hexdigest().encode("ascii")
+    compiledPath = path + ".compiled"
+    try:
+        with open(compiledPath, "rb") as compiledFile:
+            compiled = compiledFile.read()
+        if compiled[:len(csvHash) + 1] == csvHash + b"\n" and len(compiled) == len(csvHash) + 1 + len(flowerList) * GeneCodeCount:
+            return compiled[len(csvHash) + 1:]
+    except OSError:
+        pass
+    table = compileColourTable(csvBytes.decode("utf-8"))
+    try:
+        with open(compiledPath, "wb") as compiledFile:
+            compiledFile.write(csvHash + b"\n" + table)
+    except OSError:
+        pass
+    return table
+
+def getColourTable(): #Loads the colour table on first use and keeps it
+    global colourTable
+    if colourTable is None:
+        colourTable = loadColourTable()
+    return colourTable
+
+def flowerGeneCodes(flowerName): #The GeneList positions a flower can have: all 81 for Rose, the 27 bb ones for the 3 gene flowers
+    flowerBase = flowerNumbers[flowerName] * GeneCodeCount
+    colourTable = getColourTable()
+    return [gene for gene in range(GeneCodeCount) if colourTable[flowerBase + gene] != NoColour]
+
+def allFlowers(): #Every flower of every name, i.e. every gene code each flower name can have
+    listOfAllFlowers = []
+    for flowerName in flowerList:
+        flowerBase = flowerNumbers[flowerName] * GeneCodeCount
+        for gene in flowerGeneCodes(flowerName):
+            listOfAllFlowers.append(Flower.fromId(flowerBase + gene))
+    return listOfAllFlowers
+
+def pairColourCounts(flower_1, flower_2): #Takes two flower classes and outputs how likely each colour of child is, as {colour: count out of CrossCombinations}, colours in 'Colours' order
+    """
+    This is a slice of the flower name's pair colour table (see buildPairColourTable), so nothing is bred. Flowers of different names give {}.
+    """
+    if flower_1.flowerId // GeneCodeCount != flower_2.flowerId // GeneCodeCount:
+        return {}
+    colourTable = getPairColourTable(flower_1.flowerId // GeneCodeCount)
+    start = (flower_1.GeneIndex * GeneCodeCount + flower_2.GeneIndex) * len(Colours)
+    return {colour: colourTable[start + colourNumber] for colourNumber, colour in enumerate(Colours) if colourTable[start + colourNumber]}
 
 def CalculateColourProbabilities(BreedList): #Takes in the output from breed(x,y) and outputs the probability of breeding each colour of flower available in that breeding pool
     """
     Takes a breed list from breed(flowerA, flowerB)
-    :param BreedList:
-    :return:
-    """
-    colours = []
-    totals = []
-    output = {}
-    for flower in BreedList:
-        output[flower.colour] = 0.0
-    for flower in BreedList:
-        output[flower.colour] += BreedList[flower]["Probability"]
-    for entryIndex in range(len(totals)):
-        totals[entryIndex] = float(totals[entryIndex])/float(len(BreedList))
-    #print(totals)
-    for entryIndex in range(len(totals)):
-        output[colours[entryIndex]] = totals[entryIndex]
-    return output
+    :param BreedList: {child_flower: {"Count": n, "Parents": [ParentA, ParentB]}}, as breed(x,y) gives
+    :return: {colour: probability of a child of that colour}, colours in 'Colours' order. For a whole cross the probabilities add up to 1; an empty BreedList gives {}.
+    Only the children in BreedList are counted, so a filtered breed list gives the chance of breeding each colour from just the children left in it. pairColourCounts looks up a whole cross directly.
+    """
+    colourCounts = {}
+    for child in BreedList:
+        colourCounts[child.colour] = colourCounts.get(child.colour, 0) + BreedList[child]["Count"]
+    return {colour: colourCounts[colour] / CrossCombinations for colour in Colours if colour in colourCounts}
 
 GeneList = [] #Initialise all possible Gene Codes e.g. rryywwbb, RRYyWwbb, etc.
 
+GeneNumberList = [] #The R,Y,W,B gene numbers of each entry in GeneList, e.g. GeneNumberList[7] = (0,2,1,0)
+
 for b in range(3): #Sets up all Possible gene codes for reference
     for r in range(3):
         for y in range(3):
            for w in range(3):
                GeneList.append(geneCodeTranslator(r,y,w,b)) # # ##
+               GeneNumberList.append((r,y,w,b))
+
+GeneCodeCount = len(GeneList) #81, the number of gene codes a 4 gene flower can have
+
+CrossCombinations = 256 #Every cross has 4 genes with 4 punnett square entries each, so 4^4 equally likely children. Single cross chances are kept as whole number counts out of this.
+crossTable = None #Built by getCrossTable() the first time two flowers are bred
+parentIndexes = {} #tuple of parent gene codes : buildParentIndex of them, filled in by getParentIndex
+pairColourTables = {} #flower number : buildPairColourTable of it, filled in by getPairColourTable
+pairColourMasks = {} #flower number : buildPairColourMasks of it, filled in by getPairColourMasks
+pairChildMasks = {} #flower number : buildPairChildMasks of it, filled in by getPairChildMasks
+pairOutcomes = {} #(flowerA flowerId, flowerB flowerId) : [breed(flowerA, flowerB), IdentifyFlowersFromBreed of it], filled in by crossPair and crossSpecies
 
 flowerList = ["Cosmo", "Hyacinth", "Lilly", "Mum", "Pansie", "Rose", "Tulip", "Windflower"] #All flowers
 
+flowerNumbers = {flowerName: number for number, flowerName in enumerate(flowerList)} #Position of each flower in flowerList
+
 Colours = ["White", "Pink", "Red", "Orange", "Yellow", "Green", "Blue",  "Purple", "Black"] #ll colours
 
-FlowerGeneColour = {flowerList[0]: {GeneList[0]: Colours[0],
-                                     GeneList[1]: Colours[0],
-                                     GeneList[2]: Colours[0],
-                                     GeneList[3]: Colours[4],
-                                     GeneList[4]: Colours[4],
-                                     GeneList[5]: Colours[0],
-                                     GeneList[6]: Colours[4],
-                                     GeneList[7]: Colours[4],
-                                     GeneList[8]: Colours[4],
-                                     GeneList[9]: Colours[1],
-                                     GeneList[10]: Colours[1],
-                                     GeneList[11]: Colours[1],
-                                     GeneList[12]: Colours[3],
-                                     GeneList[13]: Colours[3],
-                                     GeneList[14]: Colours[1],
-                                     GeneList[15]: Colours[3],
-                                     GeneList[16]: Colours[3],
-                                     GeneList[17]: Colours[3],
-                                     GeneList[18]: Colours[2],
-                                     GeneList[19]: Colours[2],
-                                     GeneList[20]: Colours[2],
-                                     GeneList[21]: Colours[3],
-                                     GeneList[22]: Colours[3],
-                                     GeneList[23]: Colours[2],
-                                     GeneList[24]: Colours[8],
-                                     GeneList[25]: Colours[8],
-                                     GeneList[26]: Colours[2]},
-                    flowerList[1]: {GeneList[0]: Colours[0],
-                                    GeneList[1]: Colours[0],
-                                    GeneList[2]: Colours[6],
-                                    GeneList[3]: Colours[4],
-                                    GeneList[4]: Colours[4],
-                                    GeneList[5]: Colours[0],
-                                    GeneList[6]: Colours[4],
-                                    GeneList[7]: Colours[4],
-                                    GeneList[8]: Colours[4],
-                                    GeneList[9]: Colours[2],
-                                    GeneList[10]: Colours[1],
-                                    GeneList[11]: Colours[0],
-                                    GeneList[12]: Colours[3],
-                                    GeneList[13]: Colours[4],
-                                    GeneList[14]: Colours[4],
-                                    GeneList[15]: Colours[3],
-                                    GeneList[16]: Colours[4],
-                                    GeneList[17]: Colours[4],
-                                    GeneList[18]: Colours[2],
-                                    GeneList[19]: Colours[2],
-                                    GeneList[20]: Colours[2],
-                                    GeneList[21]: Colours[6],
-                                    GeneList[22]: Colours[6],
-                                    GeneList[23]: Colours[2],
-                                    GeneList[24]: Colours[7],
-                                    GeneList[25]: Colours[7],
-                                    GeneList[26]: Colours[7]},
-                    flowerList[2]: {GeneList[0]: Colours[0],
-                                    GeneList[1]: Colours[0],
-                                    GeneList[2]: Colours[0],
-                                    GeneList[3]: Colours[4],
-                                    GeneList[4]: Colours[0],
-                                    GeneList[5]: Colours[0],
-                                    GeneList[6]: Colours[4],
-                                    GeneList[7]: Colours[4],
-                                    GeneList[8]: Colours[0],
-                                    GeneList[9]: Colours[2],
-                                    GeneList[10]: Colours[1],
-                                    GeneList[11]: Colours[0],
-                                    GeneList[12]: Colours[3],
-                                    GeneList[13]: Colours[4],
-                                    GeneList[14]: Colours[4],
-                                    GeneList[15]: Colours[3],
-                                    GeneList[16]: Colours[4],
-                                    GeneList[17]: Colours[4],
-                                    GeneList[18]: Colours[8],
-                                    GeneList[19]: Colours[2],
-                                    GeneList[20]: Colours[1],
-                                    GeneList[21]: Colours[8],
-                                    GeneList[22]: Colours[2],
-                                    GeneList[23]: Colours[1],
-                                    GeneList[24]: Colours[3],
-                                    GeneList[25]: Colours[3],
-                                    GeneList[26]: Colours[0]},
-                    flowerList[3]: {GeneList[0]: Colours[0],
-                                    GeneList[1]: Colours[0],
-                                    GeneList[2]: Colours[7],
-                                    GeneList[3]: Colours[4],
-                                    GeneList[4]: Colours[4],
-                                    GeneList[5]: Colours[0],
-                                    GeneList[6]: Colours[4],
-                                    GeneList[7]: Colours[4],
-                                    GeneList[8]: Colours[4],
-                                    GeneList[9]: Colours[1],
-                                    GeneList[10]: Colours[1],
-                                    GeneList[11]: Colours[1],
-                                    GeneList[12]: Colours[4],
-                                    GeneList[13]: Colours[2],
-                                    GeneList[14]: Colours[1],
-                                    GeneList[15]: Colours[7],
-                                    GeneList[16]: Colours[7],
-                                    GeneList[17]: Colours[7],
-                                    GeneList[18]: Colours[2],
-                                    GeneList[19]: Colours[2],
-                                    GeneList[20]: Colours[2],
-                                    GeneList[21]: Colours[7],
-                                    GeneList[22]: Colours[7],
-                                    GeneList[23]: Colours[2],
-                                    GeneList[24]: Colours[5],
-                                    GeneList[25]: Colours[5],
-                                    GeneList[26]: Colours[2]},
-                    flowerList[4]: {GeneList[0]: Colours[0],
-                                    GeneList[1]: Colours[0],
-                                    GeneList[2]: Colours[6],
-                                    GeneList[3]: Colours[4],
-                                    GeneList[4]: Colours[4],
-                                    GeneList[5]: Colours[6],
-                                    GeneList[6]: Colours[4],
-                                    GeneList[7]: Colours[4],
-                                    GeneList[8]: Colours[4],
-                                    GeneList[9]: Colours[2],
-                                    GeneList[10]: Colours[2],
-                                    GeneList[11]: Colours[4],
-                                    GeneList[12]: Colours[3],
-                                    GeneList[13]: Colours[3],
-                                    GeneList[14]: Colours[3],
-                                    GeneList[15]: Colours[4],
-                                    GeneList[16]: Colours[4],
-                                    GeneList[17]: Colours[4],
-                                    GeneList[18]: Colours[2],
-                                    GeneList[19]: Colours[2],
-                                    GeneList[20]: Colours[7],
-                                    GeneList[21]: Colours[2],
-                                    GeneList[22]: Colours[2],
-                                    GeneList[23]: Colours[7],
-                                    GeneList[24]: Colours[3],
-                                    GeneList[25]: Colours[3],
-                                    GeneList[26]: Colours[7]},
-                    flowerList[5]: {GeneList[0]: Colours[0],
-                                    GeneList[1]: Colours[0],
-                                    GeneList[2]: Colours[7],
-                                    GeneList[3]: Colours[4],
-                                    GeneList[4]: Colours[0],
-                                    GeneList[5]: Colours[7],
-                                    GeneList[6]: Colours[4],
-                                    GeneList[7]: Colours[4],
-                                    GeneList[8]: Colours[0],
-                                    GeneList[9]: Colours[2],
-                                    GeneList[10]: Colours[2],
-                                    GeneList[11]: Colours[2],
-                                    GeneList[12]: Colours[3],
-                                    GeneList[13]: Colours[2],
-                                    GeneList[14]: Colours[2],
-                                    GeneList[15]: Colours[3],
-                                    GeneList[16]: Colours[3],
-                                    GeneList[17]: Colours[2],
-                                    GeneList[18]: Colours[8],
-                                    GeneList[19]: Colours[8],
-                                    GeneList[20]: Colours[8],
-                                    GeneList[21]: Colours[3],
-                                    GeneList[22]: Colours[2],
-                                    GeneList[23]: Colours[8],
-                                    GeneList[24]: Colours[3],
-                                    GeneList[25]: Colours[3],
-                                    GeneList[26]: Colours[6],
-                                    GeneList[27]: Colours[0],
-                                    GeneList[28]: Colours[0],
-                                    GeneList[29]: Colours[7],
-                                    GeneList[30]: Colours[4],
-                                    GeneList[31]: Colours[0],
-                                    GeneList[32]: Colours[7],
-                                    GeneList[33]: Colours[4],
-                                    GeneList[34]: Colours[4],
-                                    GeneList[35]: Colours[0],
-                                    GeneList[36]: Colours[1],
-                                    GeneList[37]: Colours[1],
-                                    GeneList[38]: Colours[1],
-                                    GeneList[39]: Colours[4],
-                                    GeneList[40]: Colours[1],
-                                    GeneList[41]: Colours[1],
-                                    GeneList[42]: Colours[4],
-                                    GeneList[43]: Colours[4],
-                                    GeneList[44]: Colours[1],
-                                    GeneList[45]: Colours[2],
-                                    GeneList[46]: Colours[2],
-                                    GeneList[47]: Colours[2],
-                                    GeneList[48]: Colours[3],
-                                    GeneList[49]: Colours[2],
-                                    GeneList[50]: Colours[2],
-                                    GeneList[51]: Colours[3],
-                                    GeneList[52]: Colours[3],
-                                    GeneList[53]: Colours[2],
-                                    GeneList[54]: Colours[0],
-                                    GeneList[55]: Colours[0],
-                                    GeneList[56]: Colours[7],
-                                    GeneList[57]: Colours[4],
-                                    GeneList[58]: Colours[0],
-                                    GeneList[59]: Colours[7],
-                                    GeneList[60]: Colours[4],
-                                    GeneList[61]: Colours[4],
-                                    GeneList[62]: Colours[0],
-                                    GeneList[63]: Colours[0],
-                                    GeneList[64]: Colours[0],
-                                    GeneList[65]: Colours[7],
-                                    GeneList[66]: Colours[4],
-                                    GeneList[67]: Colours[0],
-                                    GeneList[68]: Colours[7],
-                                    GeneList[69]: Colours[4],
-                                    GeneList[70]: Colours[4],
-                                    GeneList[71]: Colours[0],
-                                    GeneList[72]: Colours[1],
-                                    GeneList[73]: Colours[1],
-                                    GeneList[74]: Colours[1],
-                                    GeneList[75]: Colours[4],
-                                    GeneList[76]: Colours[0],
-                                    GeneList[77]: Colours[7],
-                                    GeneList[78]: Colours[4],
-                                    GeneList[79]: Colours[4],
-                                    GeneList[80]: Colours[0],
-                                    },
-                    flowerList[6]: {GeneList[0]: Colours[0],
-                                    GeneList[1]: Colours[0],
-                                    GeneList[2]: Colours[0],
-                                    GeneList[3]: Colours[4],
-                                    GeneList[4]: Colours[4],
-                                    GeneList[5]: Colours[0],
-                                    GeneList[6]: Colours[4],
-                                    GeneList[7]: Colours[4],
-                                    GeneList[8]: Colours[4],
-                                    GeneList[9]: Colours[2],
-                                    GeneList[10]: Colours[1],
-                                    GeneList[11]: Colours[0],
-                                    GeneList[12]: Colours[3],
-                                    GeneList[13]: Colours[4],
-                                    GeneList[14]: Colours[4],
-                                    GeneList[15]: Colours[3],
-                                    GeneList[16]: Colours[4],
-                                    GeneList[17]: Colours[4],
-                                    GeneList[18]: Colours[8],
-                                    GeneList[19]: Colours[2],
-                                    GeneList[20]: Colours[2],
-                                    GeneList[21]: Colours[8],
-                                    GeneList[22]: Colours[2],
-                                    GeneList[23]: Colours[2],
-                                    GeneList[24]: Colours[7],
-                                    GeneList[25]: Colours[7],
-                                    GeneList[26]: Colours[7]},
-                    flowerList[7]: {GeneList[0]: Colours[0],
-                                    GeneList[1]: Colours[0],
-                                    GeneList[2]: Colours[6],
-                                    GeneList[3]: Colours[3],
-                                    GeneList[4]: Colours[3],
-                                    GeneList[5]: Colours[6],
-                                    GeneList[6]: Colours[3],
-                                    GeneList[7]: Colours[3],
-                                    GeneList[8]: Colours[3],
-                                    GeneList[9]: Colours[2],
-                                    GeneList[10]: Colours[2],
-                                    GeneList[11]: Colours[6],
-                                    GeneList[12]: Colours[1],
-                                    GeneList[13]: Colours[1],
-                                    GeneList[14]: Colours[1],
-                                    GeneList[15]: Colours[3],
-                                    GeneList[16]: Colours[3],
-                                    GeneList[17]: Colours[3],
-                                    GeneList[18]: Colours[2],
-                                    GeneList[19]: Colours[2],
-                                    GeneList[20]: Colours[7],
-                                    GeneList[21]: Colours[2],
-                                    GeneList[22]: Colours[2],
-                                    GeneList[23]: Colours[7],
-                                    GeneList[24]: Colours[1],
-                                    GeneList[25]: Colours[1],
-                                    GeneList[26]: Colours[7]},
-                    } #A dictionary of all flowers, with their gene code and corresponding colour.
+ColourBits = {colour: 1 << colourNumber for colourNumber, colour in enumerate(Colours)} #Bit of each colour in a colour mask
+
+NoColour = 255 #Colour table entry for gene codes a flower cannot have, e.g. any B gene for a 3 gene flower
+
+ColourTablePath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "FlowerColours.csv") #Flower,GeneCode,Colour for every flower and gene code it can have
+colourTable = None #Loaded by getColourTable() the first time a colour is needed
+
+SolverVersion = 3 #Part of every solution cache key; bump it whenever a change to the solver changes what solve() gives back
+SolutionCacheDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SolutionCache") #Where solveCached() keeps solutions
+speciesSolutions = OrderedDict() #(flower name, seed flowerIds) : speciesSolution of them, the most recently used last
+SpeciesSolutionCacheSize = 1024 #Solutions speciesSolution remembers
 
 initialflowerPool = [
     Flower(flowerList[0],0,0,1),
@@ -736,53 +1664,7 @@ initialflowerPool = [
 
 IdentificationReasons = ["Uniqueness", "Colour", "Gene Test"]
 
-
-newFlowers = True
-UpdatedFlowerPool = initialflowerPool[:]
-UngenedflowerPool = []
-newFlowerPool = []
-generation = 0
-print(len(UpdatedFlowerPool))
-while (newFlowers):
-    print(generation) #The generation is more a curiousity/debugging tool.
-    generation += 1
-    IdentifiedFlowers = {}
-    for flower in flowerList:
-        IdentifiedFlowers[flower] = {} #Initialises a dictionary of all the flower names so we can search through them properly
-
-
-    BreedNewFlowers(UpdatedFlowerPool, IdentifiedFlowers)
-    if len(IdentifiedFlowers) == 0:
-        IdentifyUngenedFlowers(UngenedflowerPool, IdentifiedFlowers)
-
-    newFlowers = SaveFlowers(UpdatedFlowerPool, IdentifiedFlowers)
-    if not newFlowers:
-        IdentifyUngenedFlowers(UngenedflowerPool, IdentifiedFlowers)
-        newFlowers = SaveFlowers(UpdatedFlowerPool, IdentifiedFlowers)
-print(len(UpdatedFlowerPool))
-
-listOfAllFlowers = []
-
-for flowerName in flowerList:
-    if flowerName == "Rose":
-        for b in range(3):
-            for r in range(3):
-                for y in range(3):
-                    for w in range(3):
-                        listOfAllFlowers.append(Flower(flowerName, r,y,w,b))
-    else:
-        for r in range(3):
-            for y in range(3):
-                for w in range(3):
-                    listOfAllFlowers.append(Flower(flowerName, r,y,w))
-"""listOfUnidentifiedFlowers = []
-for flower in listOfAllFlowers:
-    if IsFlowerNotDiscovered(flower, UpdatedFlowerPool):
-        listOfUnidentifiedFlowers.append(flower)
-
-listOfUnidentifiedFlowers = unique(listOfUnidentifiedFlowers)
-for flower in listOfUnidentifiedFlowers:
-    print(flower.colour + " " + flower.flowerName + " (" + flower.GeneCode + ")")"""
+#The flowers the solver cannot reach are the rows of reachabilityReport() with Found False.
 
 
 
@@ -807,7 +1689,6 @@ for flower in listOfUnidentifiedFlowers:
 #Generate code for adding gene tested flowers to flower pool.
 #Think about further tests for unidentified flowers.
 
-print("Compiled successfully!")
-
-
-
+if __name__ == "__main__": #The solver's command line lives in BreedFlowers.py
+    import BreedFlowers
+    BreedFlowers.main()
@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import traceback
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+import FlowerBreeding
+
+def loadEngine(): #Builds the cross table, colour table and route tables and loads the solved flower pool, once per process. Also the initializer of each worker process.
+    if "pool" not in engine:
+        FlowerBreeding.getCrossTable()
+        FlowerBreeding.getColourTable()
+        engine["pool"] = FlowerBreeding.solveCached(FlowerBreeding.flowerList)[0]
+        for flowerName in FlowerBreeding.flowerList: #The same seeds plan_route uses by default, so no route-to query waits for a table to be built
+            FlowerBreeding.routeTable(flowerName, tuple(sorted(flower.flowerId for flower in FlowerBreeding.initialflowerPool if flower.flowerName == flowerName)))
+
+def parseFlower(flowerName, geneCode): #Flower from a flower name and a gene code, e.g. "Rose", "RRyyWWBb". 3 gene flowers may leave off the bb.
+    if flowerName not in FlowerBreeding.flowerNumbers:
+        raise ValueError("unknown flower " + repr(flowerName) + ", choose from " + ", ".join(FlowerBreeding.flowerList))
+    if len(geneCode) == 6:
+        geneCode += "bb"
+    if geneCode not in FlowerBreeding.GeneList:
+        raise ValueError("unknown gene code " + repr(geneCode))
+    flower = FlowerBreeding.Flower.fromId(FlowerBreeding.flowerNumbers[flowerName] * FlowerBreeding.GeneCodeCount + FlowerBreeding.GeneList.index(geneCode))
+    if FlowerBreeding.getColourTable()[flower.flowerId] == FlowerBreeding.NoColour:
+        raise ValueError(flowerName + " cannot have gene code " + geneCode)
+    return flower
+
+def flowerJSON(flower): #A flower as {"Flower": name, "Gene Code": code, "Colour": colour}, or None
+    if flower is None:
+        return None
+    return {"Flower": flower.flowerName, "Gene Code": flower.GeneCode, "Colour": flower.colour}
+
+def breedQuery(flowerName, geneCodeA, geneCodeB): #Every child of a pair, with its chance
+    ParentA = parseFlower(flowerName, geneCodeA)
+    ParentB = parseFlower(flowerName, geneCodeB)
+    children = FlowerBreeding.breed(ParentA, ParentB)
+    return {"Parents": [flowerJSON(ParentA), flowerJSON(ParentB)],
+            "Children": [dict(flowerJSON(child), Count=children[child]["Count"], Probability=children[child]["Count"] / FlowerBreeding.CrossCombinations) for child in children]}
+
+def colourProbabilitiesQuery(flowerName, geneCodeA, geneCodeB): #Chance of each colour from a pair, from the pair colour table
+    ParentA = parseFlower(flowerName, geneCodeA)
+    ParentB = parseFlower(flowerName, geneCodeB)
+    return {"Parents": [flowerJSON(ParentA), flowerJSON(ParentB)],
+            "Colours": {colour: count / FlowerBreeding.CrossCombinations for colour, count in FlowerBreeding.pairColourCounts(ParentA, ParentB).items()}}
+
+def routeQuery(flowerName, geneCode): #plan_route from the seed flowers, using the route tables loadEngine built. Run in a worker process, like any other query that can be slow.
+    target = parseFlower(flowerName, geneCode)
+    route = FlowerBreeding.plan_route(flowerName, target.GeneIndex)
+    if route is None:
+        return {"Target": flowerJSON(target), "Reachable": False, "Expected Crosses": None, "Steps": []}
+    return {"Target": flowerJSON(target), "Reachable": True, "Expected Crosses": float(route[0]),
+            "Steps": [{"Flower": flowerJSON(step.flower), "Parents": [flowerJSON(parent) for parent in step.parents], "Probability": float(step.probability),
+                       "ID": step.ID, "Test Flower": flowerJSON(step.testFlower),
+                       "Test Probability": None if step.testProbability is None else float(step.testProbability),
+                       "Expected Attempts": float(step.expectedAttempts)} for step in route[1]]}
+
+def geneTestQuery(flowerName, candidates, testCodes, observed): #GeneTestPlanner for a group of candidates, after some test children have been seen. Run in a worker process.
+    """
+    :param candidates: [[gene code, prior weight]] of the candidates
+    :param testCodes: Gene codes of the test flowers to choose from, or None for every solved flower of that name
+    :param observed: [[test gene code, colour]] of the test children seen so far, in order
+    """
+    loadEngine()
+    planner = FlowerBreeding.GeneTestPlanner({parseFlower(flowerName, geneCode): weight for geneCode, weight in candidates},
+                                             engine["pool"].species(flowerName) if testCodes is None else [parseFlower(flowerName, geneCode) for geneCode in testCodes])
+    for testCode, colour in observed:
+        testFlower = parseFlower(flowerName, testCode)
+        if testFlower not in planner.testFlowerList or colour not in FlowerBreeding.Colours:
+            raise ValueError("observed " + colour + " from " + testCode + ", which is not one of the test flowers and colours")
+        planner.update(testFlower, colour)
+    bestTest = planner.bestTest()
+    expectedTests = planner.expectedTests()
+    return {"Remaining": [dict(flowerJSON(candidate), Probability=float(chance)) for candidate, chance in planner.remaining().items()],
+            "Identified": flowerJSON(planner.identified()),
+            "Best Test": None if bestTest is None else dict(flowerJSON(bestTest[0]), **{"Information Gain": bestTest[1]}),
+            "Expected Tests": None if expectedTests == float("inf") else expectedTests}
+
+def splitList(value): #"a,b,c" as ["a", "b", "c"]
+    return [part for part in value.split(",") if part]
+
+def queryFunction(path, query): #The query function and arguments for one request, and whether it runs in a worker process. Raises KeyError for a missing parameter.
+    """
+    /breed?flower=Rose&a=RRyyWWbb&b=rrYYwwbb
+    /colour-probabilities?flower=Rose&a=RRyyWWbb&b=rrYYwwbb
+    /route-to?flower=Rose&target=RRyyWWBB
+    /gene-test?flower=Rose&candidates=RrYyWWbb,RrYywwbb:3&tests=rryyWWbb&observed=rryyWWbb:White
+     candidates are gene codes, each with an optional :prior weight (default 1); tests defaults to every solved flower of that name; observed is test gene code:colour
+    """
+    if path == "/breed":
+        return [breedQuery, [query["flower"], query["a"], query["b"]], False]
+    if path == "/colour-probabilities":
+        return [colourProbabilitiesQuery, [query["flower"], query["a"], query["b"]], False]
+    if path == "/route-to":
+        return [routeQuery, [query["flower"], query["target"]], True]
+    if path == "/gene-test":
+        candidates = []
+        for candidate in splitList(query["candidates"]):
+            geneCode, _, weight = candidate.partition(":")
+            candidates.append([geneCode, int(weight or 1)])
+            if candidates[-1][1] <= 0:
+                raise ValueError("candidate weights must be whole numbers above 0, got " + repr(candidate))
+        if not candidates:
+            raise ValueError("candidates needs at least one gene code")
+        testCodes = splitList(query["tests"]) if "tests" in query else None
+        observed = [observation.split(":", 1) for observation in splitList(query.get("observed", ""))]
+        if any(len(observation) != 2 for observation in observed):
+            raise ValueError("observed should be test gene code:colour, e.g. rryyWWbb:White")
+        return [geneTestQuery, [query["flower"], candidates, testCodes, observed], True]
+    return None
+
+class FlowerService(object):
+    """Answers breeding queries over HTTP/JSON, from one event loop.
+     Inputs: workers, number of worker processes for the slow queries (route-to and gene-test); 0 runs them on the event loop's own thread pool instead
+     cacheSize, number of answers to remember
+
+     Internals:
+     executor; the worker process pool. Each worker loads the engine once, when it starts.
+     answers; (path, sorted query) : [HTTP status, encoded JSON], the most recently used answers last
+     inFlight; (path, sorted query) : future of a query that is being worked out. A second identical request waits on the same future instead of working it out again.
+
+     Answers are remembered whether they are results or bad request errors (a bad request stays bad), so a repeated query is a dictionary lookup. Server errors (500) are not remembered.
+     """
+    def __init__(self, workers = None, cacheSize = 65536):
+        loadEngine()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.executor = concurrent.futures.ProcessPoolExecutor(workers, initializer=loadEngine) if workers > 0 else None
+        self.cacheSize = cacheSize
+        self.answers = OrderedDict()
+        self.inFlight = {}
+
+    async def answer(self, path, query): #[HTTP status, encoded JSON] for one request
+        key = (path, tuple(sorted(query.items())))
+        if key in self.answers:
+            self.answers.move_to_end(key)
+            return self.answers[key]
+        if key in self.inFlight:
+            return await asyncio.shield(self.inFlight[key])
+        future = asyncio.get_running_loop().create_future()
+        self.inFlight[key] = future
+        try:
+            result = await self.workOut(path, query)
+        except BaseException as error:
+            future.set_exception(error)
+            future.exception() #Marks the exception as seen, in case no one else was waiting
+            raise
+        else:
+            future.set_result(result)
+            if result[0] != 500: #A server error may not happen again
+                self.answers[key] = result
+                if len(self.answers) > self.cacheSize:
+                    self.answers.popitem(last=False)
+        finally:
+            del self.inFlight[key]
+        return result
+
+    async def workOut(self, path, query): #Runs the query function for one request: in a worker if it is slow, otherwise right here
+        try:
+            found = queryFunction(path, query)
+        except KeyError as error:
+            return [400, encode({"Error": "missing parameter " + str(error)})]
+        except ValueError as error:
+            return [400, encode({"Error": str(error)})]
+        if found is None:
+            return [404, encode({"Error": "unknown query " + path + ", choose from /breed, /colour-probabilities, /route-to, /gene-test"})]
+        function, arguments, slow = found
+        try:
+            if slow:
+                result = await asyncio.get_running_loop().run_in_executor(self.executor, function, *arguments)
+            else:
+                result = function(*arguments)
+        except ValueError as error:
+            return [400, encode({"Error": str(error)})]
+        except Exception as error: #A bug or a broken worker; answer rather than drop the connection
+            traceback.print_exc()
+            return [500, encode({"Error": type(error).__name__ + ": " + str(error)})]
+        return [200, encode(result)]
+
+    async def handleConnection(self, reader, writer): #Serves HTTP/1.1 requests on one connection until the client closes it or asks to
+        try:
+            while True:
+                requestLine = await reader.readline()
+                if not requestLine:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length") or 0):
+                    await reader.readexactly(int(headers["content-length"]))
+                parts = requestLine.decode("latin-1").split()
+                if len(parts) != 3:
+                    status, body = [400, encode({"Error": "bad request line"})]
+                elif parts[0] != "GET":
+                    status, body = [405, encode({"Error": "only GET is supported"})]
+                else:
+                    target = urlsplit(parts[1])
+                    query = {name: values[-1] for name, values in parse_qs(target.query).items()}
+                    status, body = await self.answer(target.path, query)
+                keepAlive = len(parts) == 3 and parts[2] == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(("HTTP/1.1 " + str(status) + " " + StatusNames[status] + "\r\nContent-Type: application/json\r\nContent-Length: " + str(len(body))
+                              + "\r\nConnection: " + ("keep-alive" if keepAlive else "close") + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if not keepAlive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port): #Serves requests until cancelled
+        server = await asyncio.start_server(self.handleConnection, host, port)
+        async with server:
+            print("Serving on http://" + host + ":" + str(server.sockets[0].getsockname()[1]))
+            await server.serve_forever()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+def encode(result): #A query result as UTF-8 JSON
+    return json.dumps(result).encode("utf-8")
+
+def main(arguments = None):
+    """
+    :param arguments: Command line arguments, defaults to sys.argv[1:]
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Serves breed, colour-probabilities, route-to and gene-test queries as HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for route-to and gene-test queries (default: one per CPU)")
+    args = parser.parse_args(arguments)
+    service = FlowerService(args.workers)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+StatusNames = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+engine = {} #"pool": the solved KnownFlowerIndex, filled in by loadEngine
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+import FlowerBreeding as F
+
+
+def baselineBreed(flower_1, flower_2): #breed(x,y) worked out the original way, expanding the Punnett squares of all 4 genes, as {child: count out of CrossCombinations}
+    children = {}
+    squares = [F.punnettSquare(flower_1.GeneNumbers[i], flower_2.GeneNumbers[i]) for i in range(4)]
+    for red in squares[0]:
+        for yellow in squares[1]:
+            for white in squares[2]:
+                for blue in squares[3]:
+                    child = F.Flower(flower_1.flowerName, red, yellow, white, blue)
+                    children[child] = children.get(child, 0) + 1
+    return children
+
+def baselineIdentify(breed_list): #The original IdentifyFlowersFromBreed
+    successList = []
+    allfails = []
+    failedOutput = []
+    if len(breed_list) < 2:
+        successList.append(list(breed_list)[0])
+    else:
+        for flowerE in list(breed_list):
+            failedList = []
+            Efailed = False
+            testColour = flowerE.colour
+            for flowerF in list(breed_list)[list(breed_list).index(flowerE)+1:]:
+                if flowerF.colour == testColour and flowerF not in allfails:
+                    Efailed = True
+                    failedList.append(flowerF)
+                    allfails.append(flowerF)
+            if Efailed:
+                allfails.append(flowerE)
+                failedList.append(flowerE)
+            if len(failedList) > 0:
+                failedOutput.append([failedList, testColour])
+        for flowerG in breed_list:
+            if flowerG not in allfails:
+                successList.append(flowerG)
+    return [successList, failedOutput]
+
+def samplePairs(count, seed = 0): #Random same-named pairs of flowers, the same ones every run
+    generator = random.Random(seed)
+    flowers = F.allFlowers()
+    pairs = []
+    while len(pairs) < count:
+        flowerA = generator.choice(flowers)
+        pairs.append([flowerA, generator.choice([flower for flower in flowers if flower.flowerName == flowerA.flowerName])])
+    return pairs
+
+
+def test_breed_matches_punnett_squares():
+    for flowerA, flowerB in samplePairs(500):
+        children = F.breed(flowerA, flowerB)
+        assert {child: children[child]["Count"] for child in children} == baselineBreed(flowerA, flowerB)
+        assert all(children[child]["Parents"] == [flowerA, flowerB] for child in children)
+
+def test_breed_different_names_gives_nothing():
+    assert F.breed(F.Flower("Rose", 0, 0, 1), F.Flower("Tulip", 0, 0, 1)) == {}
+
+def test_identify_flowers_from_breed_matches_baseline():
+    for flowerA, flowerB in samplePairs(500, 1):
+        children = F.breed(flowerA, flowerB)
+        assert F.IdentifyFlowersFromBreed(children) == baselineIdentify(children)
+
+
+def test_cross_all_pairs_matches_breed():
+    generator = random.Random(3)
+    for flowerName in ["Cosmo", "Rose"]:
+        flowers = generator.sample([flower for flower in F.allFlowers() if flower.flowerName == flowerName], 12)
+        batch = F.crossAllPairs(flowers, 4)
+        assert len(batch.parentsA) == 12 * 13 // 2 - 4 * 5 // 2
+        for pair, (positionA, positionB) in enumerate(zip(batch.parentsA, batch.parentsB)):
+            assert positionA <= positionB and positionB >= 4
+            children = F.breed(flowers[positionA], flowers[positionB])
+            identified, failed = F.IdentifyFlowersFromBreed(children)
+            assert list(batch.childIds[batch.offsets[pair]:batch.offsets[pair + 1]]) == [child.flowerId for child in children]
+            assert batch.identified[pair] == sum(1 << child.GeneIndex for child in identified)
+            assert batch.ambiguous[pair] == sum(1 << child.GeneIndex for group, colour in failed for child in group)
+
+
+def test_colour_probabilities_count_the_breed_list():
+    for flowerA, flowerB in samplePairs(200, 2):
+        children = F.breed(flowerA, flowerB)
+        probabilities = F.CalculateColourProbabilities(children)
+        assert probabilities == {colour: count / F.CrossCombinations for colour, count in F.pairColourCounts(flowerA, flowerB).items()}
+        assert list(probabilities) == [colour for colour in F.Colours if colour in probabilities]
+        child = next(iter(children))
+        assert F.CalculateColourProbabilities({child: children[child]}) == {child.colour: children[child]["Count"] / F.CrossCombinations}
+    assert F.CalculateColourProbabilities({}) == {}
+
+
+def routeLineages(steps): #{gene code: set of every gene code its route in steps breeds, itself included}, from routeTable's steps
+    lineages = {}
+    def lineageOf(gene):
+        if gene not in lineages:
+            step = steps[gene]
+            lineages[gene] = set() if step is None else set([gene]).union(*[lineageOf(flower.GeneIndex) for flower in step.parents + [step.testFlower] if flower is not None])
+        return lineages[gene]
+    for gene in steps:
+        lineageOf(gene)
+    return lineages
+
+def bruteForceCheaper(flowerName, cost, steps): #Every single cross, from any two reached parents with any reached test flower, that would beat cost, as {gene code: cheapest such cost}
+    flowerBase = F.flowerNumbers[flowerName] * F.GeneCodeCount
+    reached = sorted(cost)
+    lineages = routeLineages(steps)
+    lineageCost = lambda genes: sum((steps[gene].expectedAttempts for gene in genes), Fraction(0)) #Each flower bred once, however many routes share it
+    cheaper = {}
+    for number, geneA in enumerate(reached):
+        for geneB in reached[number:]:
+            children = F.breed(F.Flower.fromId(flowerBase + geneA), F.Flower.fromId(flowerBase + geneB))
+            colourGroups = F.groupByColour(children)
+            pairLineage = lineages[geneA] | lineages[geneB]
+            for child in children:
+                probability = Fraction(children[child]["Count"], F.CrossCombinations)
+                siblings = colourGroups[child.colour]
+                if len(children) < 2 or len(siblings) < 2:
+                    options = [lineageCost(pairLineage) + 1 / probability]
+                else:
+                    colourCount = sum(children[sibling]["Count"] for sibling in siblings)
+                    options = []
+                    for testGene in reached:
+                        result = F.geneTestResult(F.Flower.fromId(flowerBase + testGene), frozenset(siblings)).get(child, {})
+                        testCount = sum(result[colour]["Count"] for colour in result)
+                        if testCount:
+                            options.append(lineageCost(pairLineage | lineages[testGene]) + 1 / probability + Fraction(colourCount, children[child]["Count"]) / Fraction(testCount, F.CrossCombinations))
+                for option in options:
+                    if child.GeneIndex not in cost or option < cost[child.GeneIndex]:
+                        cheaper[child.GeneIndex] = min(option, cheaper.get(child.GeneIndex, option))
+    return cheaper
+
+@pytest.mark.parametrize("flowerName", ["Cosmo", "Lilly", "Tulip"])
+def test_route_table_is_optimal(flowerName):
+    seedIds = tuple(sorted(flower.flowerId for flower in F.initialflowerPool if flower.flowerName == flowerName))
+    cost, steps = F.routeTable(flowerName, seedIds)
+    assert bruteForceCheaper(flowerName, cost, steps) == {}
+
+def test_plan_route_costs():
+    assert F.plan_route("Lilly", "rrYYWwbb")[0] == 15
+    assert F.plan_route("Tulip", "rrYyWwbb")[0] == 10
+    assert F.plan_route("Rose", "RRyyWwBb")[0] == 41
+
+def test_plan_route_cost_is_its_steps():
+    expected, route = F.plan_route("Windflower", "RRYYWWbb")
+    assert route[-1].parents[0] == route[-1].parents[1] #A self-cross, which pays for its parent once
+    assert expected == sum(step.expectedAttempts for step in route)
+    for flowerName in ["Rose", "Windflower"]:
+        seedIds = tuple(sorted(flower.flowerId for flower in F.initialflowerPool if flower.flowerName == flowerName))
+        for gene in F.routeTable(flowerName, seedIds)[0]:
+            expected, route = F.plan_route(flowerName, gene)
+            assert expected == sum((step.expectedAttempts for step in route), Fraction(0))
+
+def test_plan_route_steps():
+    expected, route = F.plan_route("Lilly", "rrYYWwbb")
+    assert route[-1].flower.GeneCode == "rrYYWwbb"
+    made = set(flower for flower in F.initialflowerPool if flower.flowerName == "Lilly")
+    for step in route:
+        assert all(parent in made for parent in step.parents)
+        assert step.testFlower is None or step.testFlower in made
+        made.add(step.flower)
+    assert F.plan_route("Lilly", "rrYYWwbb", [F.Flower("Lilly", 0, 2, 1)]) == [0, []]
+
+
+def plannerSetup(): #The three white tulips of a rryyWwbb x rryyWwbb cross, weighted by their counts, with every default tulip to test against
+    parent = F.Flower("Tulip", 0, 0, 1)
+    children = F.breed(parent, parent)
+    candidates = {child: children[child]["Count"] for child in children if child.colour == "White"}
+    testFlowers = [flower for flower in F.initialflowerPool if flower.flowerName == "Tulip"]
+    return candidates, testFlowers
+
+def test_planner_posterior_follows_bayes_rule():
+    candidates, testFlowers = plannerSetup()
+    assert len(candidates) == 3
+    planner = F.GeneTestPlanner(candidates, testFlowers)
+    total = sum(candidates.values())
+    posterior = {candidate: Fraction(candidates[candidate], total) for candidate in candidates}
+    assert planner.remaining() == posterior
+    for testFlower in testFlowers:
+        for colour in F.Colours:
+            likelihood = {candidate: Fraction(F.pairColourCounts(candidate, testFlower).get(colour, 0), F.CrossCombinations) for candidate in candidates}
+            evidence = sum(posterior[candidate] * likelihood[candidate] for candidate in candidates)
+            if evidence == 0:
+                with pytest.raises(ValueError):
+                    planner.update(testFlower, colour)
+                continue
+            after = planner.afterColour(testFlowers.index(testFlower), F.Colours.index(colour))
+            assert after == [posterior[candidate] * likelihood[candidate] / evidence for candidate in planner.candidateList]
+            assert sum(after) == 1
+
+def test_planner_update_rules_out_candidates():
+    candidates, testFlowers = plannerSetup()
+    planner = F.GeneTestPlanner(candidates, testFlowers)
+    redTulip = F.Flower("Tulip", 2, 0, 1)
+    assert planner.bestTest()[0] == redTulip
+    planner.update(redTulip, "Red") #rryyWWbb can't give red children with a red tulip
+    assert set(planner.remaining()) == {F.Flower("Tulip", 0, 0, 0), F.Flower("Tulip", 0, 0, 1)}
+    assert planner.identified() is None
+    planner.update(redTulip, "White") #Nor can rryywwbb give white ones
+    assert planner.remaining() == {F.Flower("Tulip", 0, 0, 1): 1}
+    assert planner.identified() == F.Flower("Tulip", 0, 0, 1)
+    assert planner.bestTest() is None
+    with pytest.raises(ValueError):
+        planner.update(redTulip, "Black")
+
+
+def test_solve_scenario_matches_cold_solve():
+    F.solve_scenario(F.initialflowerPool) #Warms the caches and remembers the default seeds' solutions first
+    roseIds = tuple(flower.flowerId for flower in F.initialflowerPool if flower.flowerName == "Rose")
+    assert F.speciesSolution("Rose", roseIds) is F.speciesSolution("Rose", roseIds)
+    seeds = F.initialflowerPool + [F.Flower("Rose", 2, 0, 0, 2), F.Flower("Windflower", 0, 2, 2), F.Flower("Cosmo", 1, 1, 1)]
+    warm = F.solve_scenario(seeds)
+    cold = F.solve(F.flowerList, 1, seeds)
+    assert set(warm[0]) == set(cold[0])
+    assert warm[1] == cold[1]
+    assert warm[2] == cold[2]
+
+def test_solve_cached_ignores_corrupt_file(tmp_path):
+    key = F.solutionCacheKey(["Cosmo"], F.initialflowerPool)
+    (tmp_path / (key + ".solution")).write_bytes(b"not a pickle")
+    solution = F.solveCached(["Cosmo"], 1, cacheDirectory = str(tmp_path))
+    assert set(solution[0]) == set(F.solve(["Cosmo"], 1)[0])
+    assert set(F.solveCached(["Cosmo"], 1, cacheDirectory = str(tmp_path))[0]) == set(solution[0])
+
+def test_solve_cached_keeps_seed_order(tmp_path):
+    seeds = [flower for flower in F.initialflowerPool if flower.flowerName == "Cosmo"]
+    reordered = seeds[::-1]
+    assert F.solutionCacheKey(["Cosmo"], seeds) != F.solutionCacheKey(["Cosmo"], reordered)
+    F.solveCached(["Cosmo"], 1, seeds, cacheDirectory = str(tmp_path))
+    assert F.solveCached(["Cosmo"], 1, reordered, cacheDirectory = str(tmp_path))[1] == F.solve(["Cosmo"], 1, reordered)[1]
+
+def test_report_route_columns_follow_plan_route():
+    report = F.reachabilityReport(["Windflower"], 1)
+    for row in zip(*[report[column] for column in F.ReportColumns]):
+        row = dict(zip(F.ReportColumns, row))
+        route = F.plan_route("Windflower", row["Gene Code"])
+        if route is None:
+            assert row["Expected Crosses"] is None
+            continue
+        assert row["Expected Crosses"] == float(sum((step.expectedAttempts for step in route[1]), Fraction(0)))
+        assert row["Last Cross Probability"] == (None if row["Seed"] else float(route[1][-1].probability))